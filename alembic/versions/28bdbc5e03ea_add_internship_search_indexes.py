@@ -0,0 +1,47 @@
+"""Add internship full-text and trigram search indexes
+
+Revision ID: 28bdbc5e03ea
+Revises: dc44e1271c5e
+Create Date: 2026-10-17 11:26:52.730144
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '28bdbc5e03ea'
+down_revision: Union[str, Sequence[str], None] = 'dc44e1271c5e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.add_column('internships', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(
+            "to_tsvector('simple', coalesce(company, '') || ' ' || "
+            "coalesce(role, '') || ' ' || coalesce(location, ''))",
+            persisted=True,
+        ),
+        nullable=True,
+    ))
+    op.create_index('ix_internships_search_vector', 'internships', ['search_vector'], unique=False, postgresql_using='gin')
+    op.create_index('ix_internships_company_trgm', 'internships', ['company'], unique=False, postgresql_using='gin', postgresql_ops={'company': 'gin_trgm_ops'})
+    op.create_index('ix_internships_role_trgm', 'internships', ['role'], unique=False, postgresql_using='gin', postgresql_ops={'role': 'gin_trgm_ops'})
+    op.create_index('ix_internships_location_trgm', 'internships', ['location'], unique=False, postgresql_using='gin', postgresql_ops={'location': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_internships_location_trgm', table_name='internships')
+    op.drop_index('ix_internships_role_trgm', table_name='internships')
+    op.drop_index('ix_internships_company_trgm', table_name='internships')
+    op.drop_index('ix_internships_search_vector', table_name='internships')
+    op.drop_column('internships', 'search_vector')
@@ -0,0 +1,48 @@
+"""Add points ledger
+
+Revision ID: 33306a90302c
+Revises: a547fba5b618
+Create Date: 2026-10-17 16:20:41.772930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '33306a90302c'
+down_revision: Union[str, Sequence[str], None] = 'a547fba5b618'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('points_ledger',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('delta', sa.Integer(), nullable=False),
+    sa.Column('reason', sa.String(), nullable=False),
+    sa.Column('balance', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_points_ledger_user_id_id', 'points_ledger', ['user_id', 'id'], unique=False)
+    # Existing totals become each user's opening entry, so the ledger sums to users.points
+    op.execute(
+        """
+        INSERT INTO points_ledger (user_id, delta, reason, balance, created_at)
+        SELECT id, points, 'opening_balance', points, now() AT TIME ZONE 'utc'
+        FROM users
+        WHERE coalesce(points, 0) <> 0
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_points_ledger_user_id_id', table_name='points_ledger')
+    op.drop_table('points_ledger')
@@ -0,0 +1,36 @@
+"""Add feed_state table and internship content hash
+
+Revision ID: 37747552d397
+Revises: c6aa1fa3950b
+Create Date: 2026-10-17 09:12:41.208113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '37747552d397'
+down_revision: Union[str, Sequence[str], None] = 'c6aa1fa3950b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('feed_state',
+    sa.Column('source', sa.String(), nullable=False),
+    sa.Column('etag', sa.String(), nullable=True),
+    sa.Column('last_modified', sa.String(), nullable=True),
+    sa.Column('fetched_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('source')
+    )
+    op.add_column('internships', sa.Column('content_hash', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('internships', 'content_hash')
+    op.drop_table('feed_state')
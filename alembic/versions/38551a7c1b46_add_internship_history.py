@@ -0,0 +1,55 @@
+"""Add first/last seen times and partitioned internship history
+
+Revision ID: 38551a7c1b46
+Revises: f3b13f61b8d4
+Create Date: 2026-10-17 19:48:13.602941
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '38551a7c1b46'
+down_revision: Union[str, Sequence[str], None] = 'f3b13f61b8d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('internships', sa.Column('first_seen_at', sa.DateTime(), nullable=True))
+    op.add_column('internships', sa.Column('last_seen_at', sa.DateTime(), nullable=True))
+    # Nothing recorded when existing postings appeared; the posting date is
+    # the closest we have
+    op.execute(
+        "UPDATE internships SET "
+        "first_seen_at = coalesce(date_posted, now() AT TIME ZONE 'utc'), "
+        "last_seen_at = now() AT TIME ZONE 'utc'"
+    )
+    op.create_index(op.f('ix_internships_first_seen_at'), 'internships', ['first_seen_at'], unique=False)
+    # Monthly partitions are created (and old ones dropped) by ingest, see
+    # app/history.py
+    op.create_table('internship_history',
+    sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.Column('occurred_at', sa.DateTime(), nullable=False),
+    sa.Column('internship_id', sa.String(), nullable=False),
+    sa.Column('event', sa.String(), nullable=False),
+    sa.Column('source', sa.String(), nullable=True),
+    sa.PrimaryKeyConstraint('id', 'occurred_at'),
+    postgresql_partition_by='RANGE (occurred_at)'
+    )
+    op.create_index('ix_internship_history_event_occurred_at', 'internship_history', ['event', 'occurred_at', 'id'], unique=False)
+    op.create_index('ix_internship_history_internship_id', 'internship_history', ['internship_id', 'occurred_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_internship_history_internship_id', table_name='internship_history')
+    op.drop_index('ix_internship_history_event_occurred_at', table_name='internship_history')
+    op.drop_table('internship_history')
+    op.drop_index(op.f('ix_internships_first_seen_at'), table_name='internships')
+    op.drop_column('internships', 'last_seen_at')
+    op.drop_column('internships', 'first_seen_at')
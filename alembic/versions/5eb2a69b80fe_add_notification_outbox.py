@@ -0,0 +1,46 @@
+"""Add notification outbox and read cursors
+
+Revision ID: 5eb2a69b80fe
+Revises: 28bdbc5e03ea
+Create Date: 2026-10-17 12:40:05.318472
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5eb2a69b80fe'
+down_revision: Union[str, Sequence[str], None] = '28bdbc5e03ea'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('notifications',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('internship_id', sa.String(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['internship_id'], ['internships.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'internship_id', name='uix_notification_user_internship')
+    )
+    op.create_index('ix_notifications_user_id_id', 'notifications', ['user_id', 'id'], unique=False)
+    op.create_table('notification_cursors',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('last_seen_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('notification_cursors')
+    op.drop_index('ix_notifications_user_id_id', table_name='notifications')
+    op.drop_table('notifications')
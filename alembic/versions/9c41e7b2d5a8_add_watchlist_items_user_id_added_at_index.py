@@ -0,0 +1,44 @@
+"""Add watchlist_items (user_id, added_at) index
+
+Revision ID: 9c41e7b2d5a8
+Revises: 38551a7c1b46
+Create Date: 2026-10-17 21:12:40.318275
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c41e7b2d5a8'
+down_revision: Union[str, Sequence[str], None] = '38551a7c1b46'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The dashboard and /api/watchlist page through a user's watchlist newest
+    # first, which uix_user_company (user_id, company_name) can't serve
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_watchlist_items_user_id_added_at',
+            'watchlist_items',
+            ['user_id', sa.text('added_at DESC')],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_watchlist_items_user_id_added_at',
+            table_name='watchlist_items',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,58 @@
+"""Add unique badge per threshold
+
+Revision ID: a547fba5b618
+Revises: f254b105c9f7
+Create Date: 2026-10-17 15:52:09.604118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a547fba5b618'
+down_revision: Union[str, Sequence[str], None] = 'f254b105c9f7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keep the first copy of any badge that was awarded twice
+    op.execute(
+        """
+        DELETE FROM badges b
+        USING badges earlier
+        WHERE earlier.user_id = b.user_id
+          AND earlier.points_required = b.points_required
+          AND earlier.id < b.id
+        """
+    )
+    op.create_unique_constraint('uix_badge_user_points', 'badges', ['user_id', 'points_required'])
+    # Badges are now only awarded for thresholds crossed by new points, so
+    # fill in any the old award-everything-missing loop hadn't caught up on
+    # (names as in app/badges.py)
+    op.execute(
+        """
+        INSERT INTO badges (user_id, badge_name, badge_description, points_required, earned_at)
+        SELECT u.id,
+               CASE WHEN t <= 100
+                    THEN (ARRAY['Getting Started', 'On Track', 'Consistent', 'Dedicated', 'Achiever',
+                                'Champion', 'Master', 'Legend', 'Elite', 'Ultimate'])[t / 10]
+                    ELSE 'Superstar ' || (t / 10 - 9) END,
+               CASE WHEN t = 10 THEN 'Earned your first 10 points'
+                    ELSE 'Reached ' || t || ' points' END,
+               t,
+               now() AT TIME ZONE 'utc'
+        FROM users u
+        CROSS JOIN LATERAL generate_series(10, coalesce(u.points, 0), 10) AS t
+        ON CONFLICT ON CONSTRAINT uix_badge_user_points DO NOTHING
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uix_badge_user_points', 'badges', type_='unique')
@@ -0,0 +1,44 @@
+"""Add users points index
+
+Revision ID: ac7f498c3976
+Revises: 33306a90302c
+Create Date: 2026-10-17 16:58:12.380514
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ac7f498c3976'
+down_revision: Union[str, Sequence[str], None] = '33306a90302c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Leaderboard row comparisons on (points, id) skip NULLs
+    op.execute("UPDATE users SET points = 0 WHERE points IS NULL")
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_points_id',
+            'users',
+            ['points', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_users_points_id',
+            table_name='users',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,47 @@
+"""Add companies table
+
+Revision ID: aed39b5bf2d2
+Revises: ac7f498c3976
+Create Date: 2026-10-17 17:35:27.915306
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'aed39b5bf2d2'
+down_revision: Union[str, Sequence[str], None] = 'ac7f498c3976'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('companies',
+    sa.Column('key', sa.String(collation='C'), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('active_count', sa.Integer(), nullable=False),
+    sa.Column('latest_posted', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('key')
+    )
+    # Same aggregation as app.matching.refresh_companies
+    op.execute(
+        """
+        INSERT INTO companies (key, name, active_count, latest_posted)
+        SELECT company_key,
+               (array_agg(company ORDER BY date_posted DESC NULLS LAST))[1],
+               count(*) FILTER (WHERE active),
+               max(date_posted)
+        FROM internships
+        WHERE company_key IS NOT NULL
+        GROUP BY company_key
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('companies')
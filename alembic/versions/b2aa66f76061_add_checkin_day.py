@@ -0,0 +1,42 @@
+"""Add checkin_day with one check-in per user per day
+
+Revision ID: b2aa66f76061
+Revises: aed39b5bf2d2
+Create Date: 2026-10-17 18:12:50.441827
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2aa66f76061'
+down_revision: Union[str, Sequence[str], None] = 'aed39b5bf2d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('checkins', sa.Column('checkin_day', sa.Date(), nullable=True))
+    op.execute("UPDATE checkins SET checkin_day = coalesce(date, now() AT TIME ZONE 'utc')::date")
+    # Racing requests could check in twice on one day; keep the first
+    op.execute(
+        """
+        DELETE FROM checkins c
+        USING checkins earlier
+        WHERE earlier.user_id = c.user_id
+          AND earlier.checkin_day = c.checkin_day
+          AND earlier.id < c.id
+        """
+    )
+    op.alter_column('checkins', 'checkin_day', nullable=False)
+    op.create_unique_constraint('uix_checkin_user_day', 'checkins', ['user_id', 'checkin_day'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uix_checkin_user_day', 'checkins', type_='unique')
+    op.drop_column('checkins', 'checkin_day')
@@ -0,0 +1,55 @@
+"""Convert internships.date_posted to an indexed timestamp
+
+Revision ID: c5d50283d6cb
+Revises: 5eb2a69b80fe
+Create Date: 2026-10-17 13:52:29.904517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d50283d6cb'
+down_revision: Union[str, Sequence[str], None] = '5eb2a69b80fe'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Values were str(epoch seconds) or "None"; anything else becomes NULL
+    op.alter_column(
+        'internships',
+        'date_posted',
+        existing_type=sa.String(),
+        type_=sa.DateTime(),
+        postgresql_using=(
+            "CASE WHEN date_posted ~ '^[0-9]+(\\.[0-9]+)?$' "
+            "THEN to_timestamp(date_posted::double precision) AT TIME ZONE 'UTC' "
+            "END"
+        ),
+    )
+    # Row hashes were computed from the string form; let the next ingest refresh them
+    op.execute("UPDATE internships SET content_hash = NULL")
+    op.create_index(
+        'ix_internships_active_date_posted',
+        'internships',
+        [sa.text('date_posted DESC NULLS LAST'), sa.text('id DESC')],
+        unique=False,
+        postgresql_where=sa.text('active = true'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_internships_active_date_posted', table_name='internships')
+    op.alter_column(
+        'internships',
+        'date_posted',
+        existing_type=sa.DateTime(),
+        type_=sa.String(),
+        postgresql_using="extract(epoch from date_posted)::bigint::text",
+    )
@@ -0,0 +1,66 @@
+"""Add company keys and watchlist_matches table
+
+Revision ID: dc44e1271c5e
+Revises: 37747552d397
+Create Date: 2026-10-17 10:03:17.551920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'dc44e1271c5e'
+down_revision: Union[str, Sequence[str], None] = '37747552d397'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same normalization as app.matching.normalize_company
+COMPANY_KEY_SQL = "btrim(regexp_replace(lower({column}), '[^[:alnum:]]+', ' ', 'g'))"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('internships', sa.Column('company_key', sa.String(), nullable=True))
+    op.add_column('watchlist_items', sa.Column('company_key', sa.String(), nullable=True))
+    op.execute(
+        "UPDATE internships SET company_key = "
+        + COMPANY_KEY_SQL.format(column="company")
+    )
+    op.execute(
+        "UPDATE watchlist_items SET company_key = "
+        + COMPANY_KEY_SQL.format(column="company_name")
+    )
+    op.create_index(op.f('ix_internships_company_key'), 'internships', ['company_key'], unique=False)
+    op.create_index(op.f('ix_watchlist_items_company_key'), 'watchlist_items', ['company_key'], unique=False)
+
+    op.create_table('watchlist_matches',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('internship_id', sa.String(), nullable=False),
+    sa.Column('company_key', sa.String(), nullable=False),
+    sa.Column('matched_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['internship_id'], ['internships.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'internship_id')
+    )
+    op.create_index(op.f('ix_watchlist_matches_internship_id'), 'watchlist_matches', ['internship_id'], unique=False)
+    op.execute(
+        """
+        INSERT INTO watchlist_matches (user_id, internship_id, company_key, matched_at)
+        SELECT DISTINCT w.user_id, i.id, i.company_key, now()
+        FROM internships i
+        JOIN watchlist_items w ON w.company_key = i.company_key
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_watchlist_matches_internship_id'), table_name='watchlist_matches')
+    op.drop_table('watchlist_matches')
+    op.drop_index(op.f('ix_watchlist_items_company_key'), table_name='watchlist_items')
+    op.drop_index(op.f('ix_internships_company_key'), table_name='internships')
+    op.drop_column('watchlist_items', 'company_key')
+    op.drop_column('internships', 'company_key')
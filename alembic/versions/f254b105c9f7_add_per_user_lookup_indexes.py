@@ -0,0 +1,55 @@
+"""Add per-user lookup indexes
+
+Revision ID: f254b105c9f7
+Revises: c5d50283d6cb
+Create Date: 2026-10-17 14:31:46.127093
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f254b105c9f7'
+down_revision: Union[str, Sequence[str], None] = 'c5d50283d6cb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns) matching the dashboard's filter + sort order.
+# watchlist_items is already covered by uix_user_company (user_id, company_name).
+INDEXES = [
+    ('ix_application_logs_user_id_date_applied', 'application_logs', ['user_id', sa.text('date_applied DESC')]),
+    ('ix_checkins_user_id_date', 'checkins', ['user_id', 'date']),
+    ('ix_reminders_user_id_due_date', 'reminders', ['user_id', 'due_date']),
+    ('ix_badges_user_id_earned_at', 'badges', ['user_id', sa.text('earned_at DESC')]),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction, but it doesn't
+    # block writes to the table while the index builds
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
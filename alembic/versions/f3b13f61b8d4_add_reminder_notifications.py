@@ -0,0 +1,53 @@
+"""Add reminder due-soon notifications
+
+Revision ID: f3b13f61b8d4
+Revises: b2aa66f76061
+Create Date: 2026-10-17 19:04:27.118503
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b13f61b8d4'
+down_revision: Union[str, Sequence[str], None] = 'b2aa66f76061'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('notifications', sa.Column('kind', sa.String(), server_default='internship', nullable=False))
+    op.add_column('notifications', sa.Column('reminder_id', sa.Integer(), nullable=True))
+    op.alter_column('notifications', 'internship_id', existing_type=sa.String(), nullable=True)
+    op.create_foreign_key(None, 'notifications', 'reminders', ['reminder_id'], ['id'], ondelete='CASCADE')
+    op.create_unique_constraint('uix_notification_user_reminder', 'notifications', ['user_id', 'reminder_id'])
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_reminders_due_date',
+            'reminders',
+            ['due_date'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_reminders_due_date',
+            table_name='reminders',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.execute("DELETE FROM notifications WHERE kind <> 'internship'")
+    op.drop_constraint('uix_notification_user_reminder', 'notifications', type_='unique')
+    op.drop_constraint('notifications_reminder_id_fkey', 'notifications', type_='foreignkey')
+    op.alter_column('notifications', 'internship_id', existing_type=sa.String(), nullable=False)
+    op.drop_column('notifications', 'reminder_id')
+    op.drop_column('notifications', 'kind')
@@ -1,147 +1,91 @@
+import asyncio
+import base64
+import hashlib
+import json
 import os
-from fastapi import APIRouter, Request, Form, Depends
+from typing import Optional
+from urllib.parse import urlencode
+
+from fastapi import APIRouter, Request, Form, Depends, HTTPException
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
+from fastapi.responses import (
+    HTMLResponse,
+    RedirectResponse,
+    JSONResponse,
+    PlainTextResponse,
+    Response,
+    StreamingResponse,
+)
 from datetime import datetime, timezone, timedelta
 
-from sqlalchemy import or_, cast, Date, String
-from sqlalchemy.orm import Session
+from sqlalchemy import (
+    and_,
+    or_,
+    func,
+    select,
+    delete,
+    tuple_,
+    cast,
+    literal_column,
+    REAL,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import EmailStr
 
-from app.db import get_db
+from app.badges import badge_for, next_badge
+from app.dashboard import load_dashboard
+from app.db import get_db, render_pool_metrics
+from app.events import REMINDER_EVENT, broker
+from app.history import FIRST_SEEN, HISTORY_EVENTS
+from app.leaderboard import ranking
+from app.page_cache import (
+    get_page,
+    page_cache,
+    page_key,
+    store_page,
+    user_data_changed,
+)
+from app.points import award_points
+from app.streaks import checkin_today_utc, get_streaks
+from app.matching import (
+    normalize_company,
+    add_matches_for_company,
+    remove_matches_for_company,
+)
 from app.models import (
     User,
+    Company,
     WatchlistItem,
+    WatchlistMatch,
+    Notification,
+    NotificationCursor,
     Internship,
+    InternshipHistory,
     ApplicationLog,
+    Badge,
     CheckIn,
     Reminder,
-    Badge,
+    utcnow,
 )
 
 from app.auth import (
     validate_password_strength,
-    hash_password,
-    verify_password,
+    hash_password_async,
+    verify_password_async,
+    needs_rehash,
     get_current_user,
+    create_session_token,
+    SESSION_COOKIE,
+    SESSION_TTL_SECONDS,
 )
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 templates = Jinja2Templates(directory=os.path.join(BASE_DIR, "app", "templates"))
 router = APIRouter()
 
-
-# ─── BADGE HELPER FUNCTIONS ──────────────────────────────────────────────────
-def get_badge_info(points: int):
-    """Get badge information based on points."""
-    badges = [
-        {
-            "name": "Getting Started",
-            "description": "Earned your first 10 points",
-            "points": 10,
-            "emoji": "🌱",
-        },
-        {
-            "name": "On Track",
-            "description": "Reached 20 points",
-            "points": 20,
-            "emoji": "🚀",
-        },
-        {
-            "name": "Consistent",
-            "description": "Reached 30 points",
-            "points": 30,
-            "emoji": "⭐",
-        },
-        {
-            "name": "Dedicated",
-            "description": "Reached 40 points",
-            "points": 40,
-            "emoji": "💪",
-        },
-        {
-            "name": "Achiever",
-            "description": "Reached 50 points",
-            "points": 50,
-            "emoji": "🏆",
-        },
-        {
-            "name": "Champion",
-            "description": "Reached 60 points",
-            "points": 60,
-            "emoji": "👑",
-        },
-        {
-            "name": "Master",
-            "description": "Reached 70 points",
-            "points": 70,
-            "emoji": "🎯",
-        },
-        {
-            "name": "Legend",
-            "description": "Reached 80 points",
-            "points": 80,
-            "emoji": "💎",
-        },
-        {
-            "name": "Elite",
-            "description": "Reached 90 points",
-            "points": 90,
-            "emoji": "🔥",
-        },
-        {
-            "name": "Ultimate",
-            "description": "Reached 100 points",
-            "points": 100,
-            "emoji": "⚡",
-        },
-    ]
-
-    # Add more badges for every 10 points beyond 100
-    if points >= 100:
-        extra_badges = (points // 10) - 9  # How many beyond the initial 10
-        for i in range(10, 10 + extra_badges):
-            badge_points = i * 10
-            badges.append(
-                {
-                    "name": f"Superstar {i-9}",
-                    "description": f"Reached {badge_points} points",
-                    "points": badge_points,
-                    "emoji": "🌟",
-                }
-            )
-
-    return badges
-
-
-def check_and_award_badges(db: Session, user: User):
-    """Check if user has earned new badges and award them."""
-    available_badges = get_badge_info(user.points)
-
-    # Get already earned badges
-    earned_badges = db.query(Badge).filter(Badge.user_id == user.id).all()
-    earned_points = {badge.points_required for badge in earned_badges}
-
-    # Find new badges to award
-    new_badges = []
-    for badge_info in available_badges:
-        if (
-            badge_info["points"] <= user.points
-            and badge_info["points"] not in earned_points
-        ):
-            new_badge = Badge(
-                user_id=user.id,
-                badge_name=badge_info["name"],
-                badge_description=badge_info["description"],
-                points_required=badge_info["points"],
-            )
-            db.add(new_badge)
-            new_badges.append(badge_info)
-
-    if new_badges:
-        db.commit()
-
-    return new_badges
+# Comment line sent on idle SSE streams so proxies don't close them
+SSE_KEEPALIVE_SECONDS = 25
 
 
 # ___ APP Home Page ____________________________________________________________
@@ -160,116 +104,114 @@ def home(
 @router.get("/dashboard", response_class=HTMLResponse)
 async def dashboard(
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
-    user_checkins = db.query(CheckIn).filter(user.id == CheckIn.user_id).all()
+    # Repeat views skip both the queries and the template
+    cache_key = page_key(user.id, request.url.path)
+    cached = get_page(cache_key)
+    if cached is not None:
+        return cached
 
-    # Convert to plain dicts
-    checkin_dicts = [
-        {"date": c.date.date().isoformat(), "note": c.note}  # "YYYY-MM-DD"
-        for c in user_checkins
-    ]
-
-    watchlist = db.query(WatchlistItem).filter(WatchlistItem.user_id == user.id).all()
-    application_logs = (
-        db.query(ApplicationLog)
-        .filter(ApplicationLog.user_id == user.id)
-        .order_by(ApplicationLog.date_applied.desc())
-        .all()
-    )
-
-    # Get user badges
-    user_badges = (
-        db.query(Badge)
-        .filter(Badge.user_id == user.id)
-        .order_by(Badge.earned_at.desc())
-        .all()
-    )
-
-    # Get available badge info for progress display
-    all_badge_info = get_badge_info(user.points)
-
-    # Create a mapping of points to emoji for earned badges
-    badge_info_map = {badge["points"]: badge for badge in all_badge_info}
+    data = await load_dashboard(db, user.id)
 
     # Add emoji info to user badges
-    user_badges_with_emoji = []
-    for badge in user_badges:
-        badge_dict = {
-            "id": badge.id,
-            "badge_name": badge.badge_name,
-            "badge_description": badge.badge_description,
-            "points_required": badge.points_required,
-            "earned_at": badge.earned_at,
-            "emoji": badge_info_map.get(badge.points_required, {}).get("emoji", "🏅"),
-        }
-        user_badges_with_emoji.append(badge_dict)
-
-    # Get user reminders
-    reminders = (
-        db.query(Reminder)
-        .filter(Reminder.user_id == user.id)
-        .order_by(Reminder.due_date.asc())
-        .all()
-    )
+    for badge in data["badges"]:
+        badge["emoji"] = badge_for(badge["points_required"])["emoji"]
 
     stats = {
-        "watchlist_count": len(watchlist),
-        "application_count": len(application_logs),
-        "points": user.points,
+        "watchlist_count": data["watchlist_count"],
+        "application_count": data["application_count"],
+        "badge_count": data["badge_count"],
+        "reminder_count": data["reminder_count"],
+        "points": data["points"],
+    }
+
+    # Where "Load older"/"Load more" continue each section, if there is more
+    cursors = {
+        "applications": section_cursor(
+            data["application_logs"], data["application_count"], "date_applied"
+        ),
+        "watchlist": section_cursor(
+            data["watchlist"], data["watchlist_count"], "added_at"
+        ),
+        "badges": section_cursor(data["badges"], data["badge_count"], "earned_at"),
+        "reminders": section_cursor(
+            data["reminders"], data["reminder_count"], "due_date"
+        ),
     }
 
     today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-    return templates.TemplateResponse(
+    response = templates.TemplateResponse(
         "dashboard.html",
         {
             "request": request,
             "user": user,
-            "checkins": checkin_dicts,
             "current_year": datetime.now().year,
             "dashboard": 1,
-            "watchlist": watchlist,
-            "application_logs": application_logs,
+            "watchlist": data["watchlist"],
+            "application_logs": data["application_logs"],
+            "cursors": cursors,
             "stats": stats,
-            "user_badges": user_badges_with_emoji,
-            "all_badge_info": all_badge_info,
-            "reminders": reminders,
+            "streaks": data["streaks"],
+            "user_badges": data["badges"],
+            "next_badge": next_badge(data["points"]),
+            "reminders": data["reminders"],
             "today": today,
             "timedelta": timedelta,
         },
     )
+    return store_page(cache_key, response)
 
 
 # ─── NOTIFICATIONS ────────────────────────────────────────────────────────
 @router.get("/api/notifications")
 async def get_notifications(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
-    company_names = (
-        db.query(WatchlistItem.company_name)
-        .filter(WatchlistItem.user_id == user.id)
-        .all()
-    )
-    names = [c[0] for c in company_names]
-
-    if not names:
-        return {"new_internships": []}
-
-    # Check for internships posted in the last 24 hours
-    yesterday = datetime.now() - timedelta(days=1)
-    conditions = [Internship.company.ilike(name) for name in names]
-
-    new_internships = (
-        db.query(Internship)
-        .filter(or_(*conditions))
-        .filter(Internship.active == True)
-        .order_by(Internship.date_posted.desc())
-        .limit(10)
-        .all()
-    )
-    # .filter(Internship.date_posted >= yesterday)  # this was missing
+    # Unseen outbox entries, read as a range on (user_id, id)
+    last_seen_id = (
+        await db.scalar(
+            select(NotificationCursor.last_seen_id).where(
+                NotificationCursor.user_id == user.id
+            )
+        )
+    ) or 0
+    # Entries for postings closed since they were queued are skipped here
+    # rather than in SQL, so the cursor still moves past them
+    unseen = (
+        await db.execute(
+            select(Notification.id, Internship, Reminder)
+            .outerjoin(Internship, Internship.id == Notification.internship_id)
+            .outerjoin(Reminder, Reminder.id == Notification.reminder_id)
+            .where(Notification.user_id == user.id, Notification.id > last_seen_id)
+            .order_by(Notification.id)
+            .limit(10)
+        )
+    ).all()
+    new_internships = [
+        internship for _, internship, _ in unseen if internship and internship.active
+    ]
+    due_reminders = [reminder for _, _, reminder in unseen if reminder]
+
+    if unseen:
+        # Move the read cursor past everything scanned
+        seen_up_to = unseen[-1][0]
+        stmt = insert(NotificationCursor).values(
+            user_id=user.id, last_seen_id=seen_up_to
+        )
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[NotificationCursor.user_id],
+                set_={
+                    "last_seen_id": func.greatest(
+                        NotificationCursor.last_seen_id, stmt.excluded.last_seen_id
+                    )
+                },
+            )
+        )
+        await db.commit()
 
     # Format response
     notifications = []
@@ -285,22 +227,155 @@ async def get_notifications(
             }
         )
 
-    return {"new_internships": notifications, "current_year": datetime.now().year}
+    return {
+        "new_internships": notifications,
+        "due_reminders": [
+            {
+                "id": reminder.id,
+                "company": reminder.company,
+                "role": reminder.role,
+                "due_date": reminder.due_date,
+            }
+            for reminder in due_reminders
+        ],
+        "current_year": datetime.now().year,
+    }
+
+
+@router.get("/api/notifications/stream")
+async def notification_stream(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """
+    Server-Sent Events stream that emits an `ingest` event whenever the
+    fetcher has written new listings, and a `reminder` event when the
+    scheduler queued reminder notifications for this user, so the dashboard
+    only calls /api/notifications when there is something new to look at.
+    """
+    # Don't hold a pooled connection for the lifetime of the stream
+    await db.close()
+
+    async def events():
+        queue = broker.subscribe()
+        try:
+            yield "retry: 10000\n\n"
+            while True:
+                try:
+                    event, payload = await asyncio.wait_for(
+                        queue.get(), timeout=SSE_KEEPALIVE_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if event == REMINDER_EVENT and payload != str(user.id):
+                    continue  # another user's reminders
+                yield f"event: {event}\ndata: {payload}\n\n"
+        finally:
+            broker.unsubscribe(queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# ─── METRICS ──────────────────────────────────────────────────────────────────
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Connection pool usage and checkout waits for Prometheus to scrape."""
+    return render_pool_metrics()
+
+
+# ─── CALENDAR ─────────────────────────────────────────────────────────────────
+CALENDAR_MAX_DAYS = 366
+
+
+@router.get("/api/calendar/events")
+async def calendar_events(
+    request: Request,
+    start: datetime,
+    end: datetime,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """
+    Check-ins and reminders in [start, end), the range FullCalendar is
+    showing, read from the (user_id, checkin_day) and (user_id, due_date)
+    indexes. The body is cached per data version like rendered pages, and
+    its ETag is a hash of the body, so it is the same on every worker and a
+    refetch of unchanged data gets a 304.
+    """
+    start_day, end_day = start.date(), end.date()
+    if not start_day < end_day <= start_day + timedelta(days=CALENDAR_MAX_DAYS):
+        raise HTTPException(status_code=400, detail="Invalid date range")
+
+    cache_key = page_key(user.id, f"calendar:{start_day}:{end_day}")
+    body = page_cache.get(cache_key)
+    if body is None:
+        checkins = (
+            await db.execute(
+                select(CheckIn.id, CheckIn.checkin_day, CheckIn.note)
+                .where(CheckIn.user_id == user.id)
+                .where(CheckIn.checkin_day >= start_day, CheckIn.checkin_day < end_day)
+            )
+        ).all()
+        reminders = (
+            await db.execute(
+                select(Reminder.id, Reminder.company, Reminder.role, Reminder.due_date)
+                .where(Reminder.user_id == user.id)
+                .where(
+                    Reminder.due_date >= datetime.combine(start_day, datetime.min.time()),
+                    Reminder.due_date < datetime.combine(end_day, datetime.min.time()),
+                )
+                .order_by(Reminder.due_date)
+            )
+        ).all()
+        events = [
+            {
+                "id": f"checkin-{c.id}",
+                "type": "checkin",
+                "start": c.checkin_day.isoformat(),
+                "allDay": True,
+                "note": c.note,
+            }
+            for c in checkins
+        ] + [
+            {
+                "id": f"reminder-{r.id}",
+                "type": "reminder",
+                "title": f"{r.company}: {r.role}",
+                "start": r.due_date.date().isoformat(),
+                "allDay": True,
+            }
+            for r in reminders
+        ]
+        body = json.dumps(events).encode()
+        page_cache.set(cache_key, body)
+
+    etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 # ─── CHECK-INS ────────────────────────────────────────────────────────────────
 @router.get("/checkins", response_class=HTMLResponse)
 async def checkins(
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
     items = (
-        db.query(CheckIn)
-        .filter(CheckIn.user_id == user.id)
-        .order_by(CheckIn.date.desc())
-        .all()
-    )
+        await db.scalars(
+            select(CheckIn)
+            .where(CheckIn.user_id == user.id)
+            .order_by(CheckIn.date.desc())
+        )
+    ).all()
     return templates.TemplateResponse(
         "checkins.html",
         {
@@ -313,27 +388,10 @@ async def checkins(
 
 
 # ─── REMINDERS ────────────────────────────────────────────────────────────────
-@router.get("/reminders", response_class=HTMLResponse)
-async def reminders(
-    request: Request,
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
-):
-    items = (
-        db.query(Reminder)
-        .filter(Reminder.user_id == user.id)
-        .order_by(Reminder.due_date.asc())
-        .all()
-    )
-    return templates.TemplateResponse(
-        "reminders.html",
-        {
-            "request": request,
-            "user": user,
-            "reminders": items,
-            "current_year": datetime.now().year,
-        },
-    )
+@router.get("/reminders")
+def reminders():
+    # Reminders live on the dashboard, which pages through them
+    return RedirectResponse(url="/dashboard#reminders", status_code=303)
 
 
 @router.post("/add_reminder")
@@ -342,7 +400,7 @@ async def add_reminder(
     company: str = Form(...),
     role: str = Form(...),
     due_date: str = Form(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
     try:
@@ -362,14 +420,14 @@ async def add_reminder(
             return RedirectResponse(url="/dashboard?error=past_date", status_code=303)
 
         # Check duplicates
-        existing_reminder = (
-            db.query(Reminder)
-            .filter(
+        existing_reminder = await db.scalar(
+            select(Reminder)
+            .where(
                 Reminder.user_id == user.id,
                 Reminder.company.ilike(company.strip()),
                 Reminder.role.ilike(role.strip())
             )
-            .first()
+            .limit(1)
         )
         if existing_reminder:
             return RedirectResponse(url="/dashboard?error=duplicate_reminder", status_code=303)
@@ -384,15 +442,12 @@ async def add_reminder(
         )
         db.add(new_reminder)
 
-        # Update points
-        db_user = db.query(User).filter(User.id == user.id).first()
-        db_user.points = (db_user.points or 0) + 1
-
-        # Award badges
-        new_badges = check_and_award_badges(db, db_user)
+        # Update points and award badges
+        new_badges = await award_points(db, user, 1, "reminder_added")
 
-        db.commit()
-        db.refresh(new_reminder)
+        await user_data_changed(db, user.id)
+        await db.commit()
+        await db.refresh(new_reminder)
 
         success_message = "reminder_added"
         if new_badges:
@@ -404,32 +459,29 @@ async def add_reminder(
         return RedirectResponse(url="/dashboard?error=invalid_date", status_code=303)
     except Exception as e:
         print(f"Error adding reminder: {e}")
-        db.rollback()
+        await db.rollback()
         return RedirectResponse(url="/dashboard?error=database_error", status_code=303)
 
 @router.post("/complete_reminder")
 async def complete_reminder(
     request: Request,
     reminder_id: int = Form(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
-    reminder = (
-        db.query(Reminder)
-        .filter(Reminder.id == reminder_id, Reminder.user_id == user.id)
-        .first()
+    reminder = await db.scalar(
+        select(Reminder).where(Reminder.id == reminder_id, Reminder.user_id == user.id)
     )
 
     if reminder:
-        db.delete(reminder)
-        # Award points for completing a reminder
-        db_user = db.query(User).filter(User.id == user.id).first()
-        db_user.points += 2  # Points for follow-through
+        await db.delete(reminder)
+        # Award points for completing a reminder, and any badges earned
+        new_badges = await award_points(
+            db, user, 2, "reminder_completed"
+        )  # Points for follow-through
 
-        # Check for new badges
-        new_badges = check_and_award_badges(db, db_user)
-
-        db.commit()
+        await user_data_changed(db, user.id)
+        await db.commit()
 
         success_message = "reminder_completed"
         if new_badges:
@@ -457,12 +509,12 @@ async def register_user(
     username: str = Form(...),
     email: EmailStr = Form(...),
     password: str = Form(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    existing_user = (
-        db.query(User)
-        .filter((User.email == email) | (User.username == username))
-        .first()
+    existing_user = await db.scalar(
+        select(User)
+        .where((User.email == email) | (User.username == username))
+        .limit(1)
     )
 
     if existing_user:
@@ -474,10 +526,10 @@ async def register_user(
         )
 
     validate_password_strength(password)
-    hashed_pw = hash_password(password)
+    hashed_pw = await hash_password_async(password)
     new_user = User(username=username, email=email, password_hash=hashed_pw)
     db.add(new_user)
-    db.commit()
+    await db.commit()
     return RedirectResponse(url="/login?msg=Registration+successful!", status_code=303)
 
 
@@ -499,10 +551,10 @@ async def handle_login(
     request: Request,
     username: str = Form(...),
     password: str = Form(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    user = db.query(User).filter(User.username == username).first()
-    if not user or not verify_password(password, user.password_hash):
+    user = await db.scalar(select(User).where(User.username == username))
+    if not user or not await verify_password_async(password, user.password_hash):
         return templates.TemplateResponse(
             "login.html",
             {
@@ -512,143 +564,229 @@ async def handle_login(
             },
             status_code=400,
         )
+    if needs_rehash(user.password_hash):
+        # BCRYPT_ROUNDS was raised since this hash was made
+        user.password_hash = await hash_password_async(password)
+        await db.commit()
     response = RedirectResponse(url="/dashboard", status_code=302)
-    response.set_cookie(key="user_id", value=str(user.id), httponly=True)
+    response.set_cookie(
+        key=SESSION_COOKIE,
+        value=create_session_token(user.id),
+        max_age=SESSION_TTL_SECONDS,
+        httponly=True,
+        samesite="lax",
+    )
     return response
 
 
 @router.get("/logout")
 async def logout():
     response = RedirectResponse(url="/login", status_code=302)
-    response.delete_cookie("user_id")
+    response.delete_cookie(SESSION_COOKIE)
     return response
 
 
 # ─── WATCHLIST (Display / Add / Remove) ───────────────────────────────────────
+WATCHLIST_PER_PAGE = 10
+
+
+def prefix_range(prefix: str):
+    """Bounds of the keys starting with `prefix`, in "C" (code point) order."""
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
 @router.get("/watchlist", response_class=HTMLResponse)
 async def display_watchlist(
     request: Request,
-    page: int = 1,
-    db: Session = Depends(get_db),
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    prefix: str = "",
+    db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
-
-    PER_PAGE = 10
-    offset = (page - 1) * PER_PAGE
-
-    all_companies = (
-        db.query(Internship.company)
-        .distinct()
-        .order_by(Internship.company)
-        .offset(offset)
-        .limit(PER_PAGE)
-        .all()
+    """
+    Companies from the companies table, keyset paginated on their key:
+    `after`/`before` are the last/first key of the neighbouring page, and
+    `prefix` narrows the list to a range of the same index.
+    """
+    query = select(Company)
+    key_prefix = normalize_company(prefix)
+    if key_prefix:
+        low, high = prefix_range(key_prefix)
+        query = query.where(Company.key >= low, Company.key < high)
+
+    if before is not None:
+        page_rows = (
+            await db.scalars(
+                query.where(Company.key < before)
+                .order_by(Company.key.desc())
+                .limit(WATCHLIST_PER_PAGE + 1)
+            )
+        ).all()
+        has_previous = len(page_rows) > WATCHLIST_PER_PAGE
+        has_next = True
+        page_rows = list(reversed(page_rows[:WATCHLIST_PER_PAGE]))
+    else:
+        if after is not None:
+            query = query.where(Company.key > after)
+        page_rows = (
+            await db.scalars(
+                query.order_by(Company.key).limit(WATCHLIST_PER_PAGE + 1)
+            )
+        ).all()
+        has_previous = after is not None
+        has_next = len(page_rows) > WATCHLIST_PER_PAGE
+        page_rows = page_rows[:WATCHLIST_PER_PAGE]
+
+    watchlist_keys = set(
+        (
+            await db.scalars(
+                select(WatchlistItem.company_key).where(
+                    WatchlistItem.user_id == user.id
+                )
+            )
+        ).all()
     )
-
-    total_companies = db.query(Internship.company).distinct().count()
-    total_pages = (total_companies + PER_PAGE - 1) // PER_PAGE
-
-    watchlist_set = {
-        item.company_name
-        for item in db.query(WatchlistItem).filter(WatchlistItem.user_id == user.id)
-    }
     companies = [
-        {"name": c.company, "in_watchlist": c.company in watchlist_set}
-        for c in all_companies
+        {
+            "name": c.name,
+            "active_count": c.active_count,
+            "latest_posted": c.latest_posted,
+            "in_watchlist": c.key in watchlist_keys,
+        }
+        for c in page_rows
     ]
 
+    def page_url(**params):
+        if prefix:
+            params["prefix"] = prefix
+        return f"/watchlist?{urlencode(params)}"
+
     return templates.TemplateResponse(
         "display_watchlist.html",
         {
             "request": request,
             "user": user,
             "companies": companies,
-            "page": page,
-            "total_pages": total_pages,
+            "prefix": prefix,
+            # Add/remove come back to this same page
+            "return_to": request.url.query,
+            "previous_url": (
+                page_url(before=page_rows[0].key)
+                if has_previous and page_rows
+                else None
+            ),
+            "next_url": (
+                page_url(after=page_rows[-1].key) if has_next and page_rows else None
+            ),
         },
     )
 
 
+def watchlist_url(return_to: str) -> str:
+    # Only ever a query string, appended to our own path
+    return f"/watchlist?{return_to}" if return_to else "/watchlist"
+
+
 @router.post("/add_to_watchlist", response_class=HTMLResponse)
 async def add_to_watchlist(
     request: Request,
     company_name: str = Form(...),
-    page: int = Form(1),
-    db: Session = Depends(get_db),
+    return_to: str = Form(""),
+    db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
-    exists = (
-        db.query(WatchlistItem)
-        .filter_by(user_id=user.id, company_name=company_name.strip())
-        .first()
+    company_key = normalize_company(company_name)
+    exists = await db.scalar(
+        select(WatchlistItem.id).filter_by(user_id=user.id, company_key=company_key)
     )
-    if exists:
-        msg = f"{company_name} is already in your watchlist"
-    else:
-        new_item = WatchlistItem(user_id=user.id, company_name=company_name.strip())
+    if not exists:
+        new_item = WatchlistItem(
+            user_id=user.id, company_name=company_name.strip(), company_key=company_key
+        )
         db.add(new_item)
-        db.commit()
+        await db.flush()
+        await db.run_sync(add_matches_for_company, user.id, company_key)
+        await user_data_changed(db, user.id)
+        await db.commit()
 
-    return RedirectResponse(url=f"/watchlist?page={page}", status_code=303)
+    return RedirectResponse(url=watchlist_url(return_to), status_code=303)
 
 
 @router.post("/remove_from_watchlist", response_class=HTMLResponse)
 async def remove_from_watchlist(
     request: Request,
     company_name: str = Form(...),
-    page: int = Form(1),
-    db: Session = Depends(get_db),
+    return_to: str = Form(""),
+    db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
-    item = (
-        db.query(WatchlistItem)
-        .filter_by(user_id=user.id, company_name=company_name.strip())
-        .first()
-    )
-    if item:
-        db.delete(item)
-        db.commit()
-    return RedirectResponse(url=f"/watchlist?page={page}", status_code=303)
+    # By key: the companies page shows the latest spelling of the name
+    company_key = normalize_company(company_name)
+    removed = (
+        await db.scalars(
+            delete(WatchlistItem)
+            .where(
+                WatchlistItem.user_id == user.id,
+                WatchlistItem.company_key == company_key,
+            )
+            .returning(WatchlistItem.id)
+        )
+    ).all()
+    if removed:
+        await db.run_sync(remove_matches_for_company, user.id, company_key)
+        await user_data_changed(db, user.id)
+        await db.commit()
+    return RedirectResponse(url=watchlist_url(return_to), status_code=303)
 
 
 # ─── INTERNSHIPS ───────────────────────────────────────────────────────────────
 @router.get("/internships", response_class=HTMLResponse)
 async def show_matching_internships(
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
-    company_names = (
-        db.query(WatchlistItem.company_name)
-        .filter(WatchlistItem.user_id == user.id)
-        .all()
-    )
-    names = [c[0] for c in company_names]
-    if not names:
+    # The success/error banners come from the query string, so only the
+    # plain page is cached
+    cache_key = None if request.query_params else page_key(user.id, request.url.path)
+    cached = get_page(cache_key) if cache_key else None
+    if cached is not None:
+        return cached
+
+    # Statistics for each watchlist company, counted in one grouped query
+    watchlist_stats = [
+        {"company": name, "count": count}
+        for name, count in (
+            await db.execute(
+                select(WatchlistItem.company_name, func.count(Internship.id))
+                .outerjoin(
+                    Internship,
+                    and_(
+                        Internship.company_key == WatchlistItem.company_key,
+                        Internship.active == True,
+                    ),
+                )
+                .where(WatchlistItem.user_id == user.id)
+                .group_by(WatchlistItem.id, WatchlistItem.company_name)
+                .order_by(WatchlistItem.id)
+            )
+        ).all()
+    ]
+    if not watchlist_stats:
         matched_internships = []
-        watchlist_stats = []
     else:
-        conditions = [Internship.company.ilike(f"%{name}%") for name in names]
         matched_internships = (
-            db.query(Internship)
-            .filter(or_(*conditions))
-            .filter(Internship.active == True)
-            .order_by(Internship.date_posted.desc())
-            .all()
-        )
-
-        # Generate statistics for each watchlist company
-        watchlist_stats = []
-        for name in names:
-            count = (
-                db.query(Internship)
-                .filter(Internship.company.ilike(f"%{name}%"))
-                .filter(Internship.active == True)
-                .count()
+            await db.scalars(
+                select(Internship)
+                .join(WatchlistMatch, WatchlistMatch.internship_id == Internship.id)
+                .where(WatchlistMatch.user_id == user.id)
+                .where(Internship.active == True)
+                .order_by(Internship.date_posted.desc().nulls_last())
             )
-            watchlist_stats.append({"company": name, "count": count})
+        ).all()
 
-    return templates.TemplateResponse(
+    response = templates.TemplateResponse(
         "internship.html",
         {
             "request": request,
@@ -658,6 +796,424 @@ async def show_matching_internships(
             "current_year": datetime.now().year,
         },
     )
+    return store_page(cache_key, response) if cache_key else response
+
+
+# ─── INTERNSHIP SEARCH ────────────────────────────────────────────────────────
+SEARCH_PAGE_MAX = 50
+
+
+def encode_cursor(*values) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def decode_cursor(cursor: str, size: int = 2):
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except ValueError:
+        values = None
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+@router.get("/api/internships/search")
+async def search_internships(
+    q: str = "",
+    active: Optional[bool] = None,
+    season: Optional[str] = None,
+    posted_since: Optional[datetime] = None,
+    seen_since: Optional[datetime] = None,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """
+    Searches company, role and location. Full-text matches (GIN index on
+    search_vector) and fuzzy trigram matches (pg_trgm GIN indexes) are ranked
+    together; without `q` the newest postings come first (partial index on
+    date_posted). `seen_since` keeps postings ingest first saw after that
+    time. Pages are keyset paginated: pass back `next_cursor` to continue.
+    """
+    limit = max(1, min(limit, SEARCH_PAGE_MAX))
+    q = q.strip()
+
+    filters = []
+    if active is not None:
+        filters.append(Internship.active == active)
+    if season:
+        filters.append(Internship.season == season)
+    if posted_since:
+        filters.append(Internship.date_posted >= posted_since)
+    if seen_since:
+        filters.append(Internship.first_seen_at >= as_utc(seen_since))
+
+    if q:
+        tsquery = func.websearch_to_tsquery(literal_column("'simple'::regconfig"), q)
+        rank = func.greatest(
+            func.ts_rank_cd(Internship.search_vector, tsquery),
+            func.similarity(Internship.company, q),
+            func.similarity(Internship.role, q),
+        )
+        query = select(Internship, rank.label("rank")).where(
+            or_(
+                Internship.search_vector.op("@@")(tsquery),
+                Internship.company.op("%")(q),
+                Internship.role.op("%")(q),
+                Internship.location.op("%")(q),
+            )
+        )
+        sort_key = rank
+    else:
+        query = select(Internship, Internship.date_posted.label("rank"))
+        sort_key = Internship.date_posted
+    query = query.where(*filters)
+
+    if cursor:
+        last_rank, last_id = decode_cursor(cursor)
+        if q:
+            query = query.where(
+                tuple_(sort_key, Internship.id) < tuple_(cast(last_rank, REAL), last_id)
+            )
+        elif last_rank is None:
+            # Undated postings sort last, so only those are left
+            query = query.where(
+                Internship.date_posted.is_(None), Internship.id < last_id
+            )
+        else:
+            try:
+                last_posted = datetime.fromisoformat(last_rank)
+            except (TypeError, ValueError):
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+            query = query.where(
+                or_(
+                    tuple_(Internship.date_posted, Internship.id)
+                    < tuple_(last_posted, last_id),
+                    Internship.date_posted.is_(None),
+                )
+            )
+
+    rows = (
+        await db.execute(
+            query.order_by(sort_key.desc().nulls_last(), Internship.id.desc()).limit(
+                limit
+            )
+        )
+    ).all()
+
+    results = [
+        {
+            "id": internship.id,
+            "company": internship.company,
+            "role": internship.role,
+            "location": internship.location,
+            "season": internship.season,
+            "active": internship.active,
+            "date_posted": internship.date_posted,
+            "link": internship.link,
+        }
+        for internship, _ in rows
+    ]
+    next_cursor = None
+    if len(rows) == limit:
+        last_internship, last_rank = rows[-1]
+        if isinstance(last_rank, datetime):
+            last_rank = last_rank.isoformat()
+        next_cursor = encode_cursor(last_rank, last_internship.id)
+
+    return {"results": results, "next_cursor": next_cursor}
+
+
+def as_utc(moment: datetime) -> datetime:
+    """Naive UTC, as ingest timestamps are stored."""
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment
+
+
+@router.get("/api/internships/changes")
+async def internship_changes(
+    event: str = FIRST_SEEN,
+    hours: int = 24,
+    since: Optional[datetime] = None,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """
+    Postings that were first seen (event=first_seen), closed (deactivated)
+    or reopened (activated) since `since`, or in the last `hours` hours,
+    newest first. A range on the (event, occurred_at, id) index of the
+    recent history partitions only.
+    """
+    if event not in HISTORY_EVENTS:
+        raise HTTPException(status_code=400, detail="Invalid event")
+    limit = max(1, min(limit, SEARCH_PAGE_MAX))
+    if since is None:
+        since = datetime.now(timezone.utc) - timedelta(hours=hours)
+
+    query = (
+        select(InternshipHistory, Internship)
+        .join(Internship, Internship.id == InternshipHistory.internship_id)
+        .where(
+            InternshipHistory.event == event,
+            InternshipHistory.occurred_at >= as_utc(since),
+        )
+    )
+    if cursor:
+        last_at, last_id = decode_cursor(cursor)
+        try:
+            last_at = datetime.fromisoformat(last_at)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.where(
+            tuple_(InternshipHistory.occurred_at, InternshipHistory.id)
+            < tuple_(last_at, last_id)
+        )
+    rows = (
+        await db.execute(
+            query.order_by(
+                InternshipHistory.occurred_at.desc(), InternshipHistory.id.desc()
+            ).limit(limit)
+        )
+    ).all()
+
+    results = [
+        {
+            "id": internship.id,
+            "company": internship.company,
+            "role": internship.role,
+            "location": internship.location,
+            "active": internship.active,
+            "link": internship.link,
+            "event": change.event,
+            "occurred_at": change.occurred_at,
+            "source": change.source,
+        }
+        for change, internship in rows
+    ]
+    next_cursor = None
+    if len(rows) == limit:
+        last = rows[-1][0]
+        next_cursor = encode_cursor(last.occurred_at.isoformat(), last.id)
+    return {"results": results, "next_cursor": next_cursor}
+
+
+# ─── HISTORY ──────────────────────────────────────────────────────────────────
+HISTORY_PAGE_MAX = 50
+
+
+def section_cursor(rows, count: int, sort_field: str):
+    """
+    The history_page cursor continuing a dashboard section after its last
+    row, or None when the section already shows all `count` rows.
+    """
+    if len(rows) >= count:
+        return None
+    last = rows[-1]
+    return encode_cursor(last[sort_field].isoformat(), last["id"])
+
+
+async def history_page(db, model, sort_column, user_id, limit, cursor, ascending=False):
+    """
+    Keyset page of a user's rows on the (user_id, <sort_column>) index,
+    newest first unless `ascending`. Returns (rows, next_cursor).
+    """
+    limit = max(1, min(limit, HISTORY_PAGE_MAX))
+    query = select(model).where(model.user_id == user_id)
+    if cursor:
+        last_sort, last_id = decode_cursor(cursor)
+        try:
+            last_sort = datetime.fromisoformat(last_sort)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        key, last_key = tuple_(sort_column, model.id), tuple_(last_sort, last_id)
+        query = query.where(key > last_key if ascending else key < last_key)
+    if ascending:
+        order_by = (sort_column.asc(), model.id.asc())
+    else:
+        order_by = (sort_column.desc(), model.id.desc())
+    rows = (await db.scalars(query.order_by(*order_by).limit(limit))).all()
+    next_cursor = None
+    if len(rows) == limit:
+        last = rows[-1]
+        next_cursor = encode_cursor(
+            getattr(last, sort_column.key).isoformat(), last.id
+        )
+    return rows, next_cursor
+
+
+@router.get("/api/applications")
+async def application_history(
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """Application log, newest first; the dashboard only shows the latest."""
+    rows, next_cursor = await history_page(
+        db, ApplicationLog, ApplicationLog.date_applied, user.id, limit, cursor
+    )
+    results = [
+        {
+            "id": log.id,
+            "company": log.company,
+            "role": log.role,
+            "status": log.status,
+            "date_applied": log.date_applied,
+        }
+        for log in rows
+    ]
+    return {"results": results, "next_cursor": next_cursor}
+
+
+@router.get("/api/checkins")
+async def checkin_history(
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """Check-ins, newest first, beyond the dashboard calendar's window."""
+    rows, next_cursor = await history_page(
+        db, CheckIn, CheckIn.date, user.id, limit, cursor
+    )
+    results = [
+        {"id": c.id, "date": c.date.date().isoformat(), "note": c.note} for c in rows
+    ]
+    return {"results": results, "next_cursor": next_cursor}
+
+
+@router.get("/api/reminders")
+async def reminder_list(
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """Reminders, soonest due first, past the dashboard's first page."""
+    rows, next_cursor = await history_page(
+        db, Reminder, Reminder.due_date, user.id, limit, cursor, ascending=True
+    )
+    results = [
+        {
+            "id": r.id,
+            "company": r.company,
+            "role": r.role,
+            "due_date": r.due_date,
+        }
+        for r in rows
+    ]
+    return {"results": results, "next_cursor": next_cursor}
+
+
+@router.get("/api/watchlist")
+async def watchlist_items(
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """Watchlist, most recently added first."""
+    rows, next_cursor = await history_page(
+        db, WatchlistItem, WatchlistItem.added_at, user.id, limit, cursor
+    )
+    results = [
+        {"id": item.id, "company_name": item.company_name, "added_at": item.added_at}
+        for item in rows
+    ]
+    return {"results": results, "next_cursor": next_cursor}
+
+
+@router.get("/api/badges")
+async def earned_badges(
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """Earned badges, newest first."""
+    rows, next_cursor = await history_page(
+        db, Badge, Badge.earned_at, user.id, limit, cursor
+    )
+    results = [
+        {
+            "id": badge.id,
+            "badge_name": badge.badge_name,
+            "badge_description": badge.badge_description,
+            "points_required": badge.points_required,
+            "earned_at": badge.earned_at,
+            "emoji": badge_for(badge.points_required)["emoji"],
+        }
+        for badge in rows
+    ]
+    return {"results": results, "next_cursor": next_cursor}
+
+
+# ─── LEADERBOARD ──────────────────────────────────────────────────────────────
+LEADERBOARD_TOP_MAX = 100
+LEADERBOARD_AROUND_MAX = 10
+
+
+def leaderboard_entry(tree, username: str, points: Optional[int]):
+    points = points or 0
+    return {"username": username, "points": points, "rank": ranking.rank(points, tree)}
+
+
+@router.get("/api/leaderboard")
+async def leaderboard(
+    top: int = 10,
+    around: int = 2,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """
+    The global top `top` users and the current user's rank with `around`
+    neighbours on each side. Rows come off the (points, id) index; ranks
+    come from the in-memory ranking, so nothing sorts the users table.
+    """
+    top = max(1, min(top, LEADERBOARD_TOP_MAX))
+    around = max(0, min(around, LEADERBOARD_AROUND_MAX))
+    # Ranks come from this tree even if a notification drops ranking.tree
+    # while the queries below are awaited
+    tree = await ranking.ensure_loaded(db)
+
+    leaders = (
+        await db.execute(
+            select(User.username, User.points)
+            .order_by(User.points.desc(), User.id.desc())
+            .limit(top)
+        )
+    ).all()
+
+    points = await db.scalar(select(User.points).where(User.id == user.id)) or 0
+    position = tuple_(User.points, User.id)
+    above = (
+        await db.execute(
+            select(User.username, User.points)
+            .where(position > tuple_(points, user.id))
+            .order_by(User.points.asc(), User.id.asc())
+            .limit(around)
+        )
+    ).all()
+    below = (
+        await db.execute(
+            select(User.username, User.points)
+            .where(position < tuple_(points, user.id))
+            .order_by(User.points.desc(), User.id.desc())
+            .limit(around)
+        )
+    ).all()
+
+    return {
+        "top": [leaderboard_entry(tree, *row) for row in leaders],
+        "me": leaderboard_entry(tree, user.username, points),
+        "neighbours": [leaderboard_entry(tree, *row) for row in reversed(above)]
+        + [leaderboard_entry(tree, user.username, points)]
+        + [leaderboard_entry(tree, *row) for row in below],
+    }
 
 
 # ─── APPLICATION LOGGING ──────────────────────────────────────────────────────
@@ -665,7 +1221,7 @@ async def show_matching_internships(
 async def apply_internship(
     request: Request,
     internship_id: str = Form(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
     try:
@@ -678,7 +1234,7 @@ async def apply_internship(
         internship_id = internship_id.strip()
 
         # Get the internship details
-        internship = db.query(Internship).filter(Internship.id == internship_id).first()
+        internship = await db.get(Internship, internship_id)
 
         if not internship:
             print(f"Error: No internship found with ID {internship_id}")
@@ -687,14 +1243,14 @@ async def apply_internship(
         print(f"Found internship: {internship.company} - {internship.role}")
 
         # Check if user already applied to this specific internship
-        existing_log = (
-            db.query(ApplicationLog)
-            .filter(
+        existing_log = await db.scalar(
+            select(ApplicationLog)
+            .where(
                 ApplicationLog.user_id == user.id,
                 ApplicationLog.company == internship.company,
                 ApplicationLog.role == internship.role,
             )
-            .first()
+            .limit(1)
         )
 
         if existing_log:
@@ -715,15 +1271,12 @@ async def apply_internship(
         )
 
         db.add(new_log)
-        # Increment user points for logging an application
-        db_user = db.query(User).filter(User.id == user.id).first()
-        db_user.points += 5
+        # Increment user points for logging an application, and award badges
+        new_badges = await award_points(db, user, 5, "application_logged")
 
-        # Check for new badges
-        new_badges = check_and_award_badges(db, db_user)
-
-        db.commit()
-        db.refresh(new_log)  # Refresh to get the updated object
+        await user_data_changed(db, user.id)
+        await db.commit()
+        await db.refresh(new_log)  # Refresh to get the updated object
 
         print(f"Successfully logged application for user {user.id}")
         return RedirectResponse(url="/internships?success=applied", status_code=303)
@@ -734,7 +1287,7 @@ async def apply_internship(
         return RedirectResponse(url="/internships?error=invalid_id", status_code=303)
     except Exception as e:
         print(f"Error logging application: {e}")
-        db.rollback()
+        await db.rollback()
         return RedirectResponse(
             url="/internships?error=database_error", status_code=303
         )
@@ -742,30 +1295,35 @@ async def apply_internship(
 
 @router.post("/api/checkin")
 async def checkin_today(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
-    today = datetime.now(timezone.utc).date()
-    exists = (
-        db.query(CheckIn)
-        .filter(CheckIn.user_id == user.id)
-        .filter(CheckIn.date.cast(Date) == today)
-        .first()
+    # The unique (user_id, checkin_day) constraint makes this idempotent,
+    # even for concurrent requests
+    checkin_id = await db.scalar(
+        insert(CheckIn)
+        .values(
+            user_id=user.id,
+            date=utcnow(),
+            checkin_day=checkin_today_utc(),
+        )
+        .on_conflict_do_nothing(constraint="uix_checkin_user_day")
+        .returning(CheckIn.id)
     )
-    if exists:
+    if checkin_id is None:
+        await db.rollback()
         return JSONResponse(content={"message": "Already checked in"}, status_code=400)
 
-    new_checkin = CheckIn(user_id=user.id, date=datetime.now(timezone.utc))
-    db_user = db.query(User).filter(User.id == user.id).first()
-    db_user.points += 2
-
-    # Check for new badges
-    new_badges = check_and_award_badges(db, db_user)
+    new_badges = await award_points(db, user, 2, "checkin")
+    streaks = await get_streaks(db, user.id)
+    await user_data_changed(db, user.id)
+    await db.commit()
 
-    db.add(new_checkin)
-    db.commit()
-
-    response_data = {"message": "Check-in successful", "points": db_user.points}
+    response_data = {
+        "message": "Check-in successful",
+        "points": user.points,
+        "streaks": streaks,
+    }
     if new_badges:
         response_data["new_badges"] = new_badges
 
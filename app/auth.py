@@ -1,12 +1,54 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import bcrypt
 from fastapi import Request, HTTPException, Depends
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.cache import TTLCache
 from app.db import get_db
+from app.events import USER_CHANNEL, broker
 from app.models import User
 
 import re
 
+# Signs session cookies. Without it sessions only last as long as the process.
+SECRET_KEY = os.getenv("SECRET_KEY")
+if not SECRET_KEY:
+    print("Warning: SECRET_KEY is not set, using a random per-process key", flush=True)
+    SECRET_KEY = secrets.token_urlsafe(32)
+
+SESSION_COOKIE = "session"
+SESSION_TTL_SECONDS = int(os.getenv("SESSION_TTL_SECONDS", str(7 * 24 * 3600)))
+
+# Logged-in users kept in memory so most requests skip the users lookup.
+# Entries are dropped when a commit changes the user and expire after the TTL,
+# which bounds staleness between worker processes.
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+USER_CACHE_COLUMNS = ("id", "username", "email", "created_at", "points")
+user_cache = TTLCache(maxsize=USER_CACHE_SIZE, ttl=USER_CACHE_TTL_SECONDS)
+
+# bcrypt work factor for new hashes. Raising it upgrades existing hashes the
+# next time their owner logs in.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+# bcrypt runs on these threads (it releases the GIL), never on the event loop
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", "2"))
+# Hash/verify calls allowed to wait for a worker before we answer 503
+HASH_QUEUE_LIMIT = int(os.getenv("HASH_QUEUE_LIMIT", "32"))
+
+_hash_pool = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="bcrypt")
+_hash_in_flight = 0
+
 
 def validate_password_strength(password: str):
     if len(password) < 8:
@@ -26,7 +68,9 @@ def validate_password_strength(password: str):
 
 
 def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+    return bcrypt.hashpw(
+        password.encode("utf-8"), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
+    ).decode("utf-8")
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -35,18 +79,113 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     )
 
 
-def get_current_user(
+def needs_rehash(hashed_password: str) -> bool:
+    """True when the hash was made with fewer rounds than BCRYPT_ROUNDS."""
+    try:
+        rounds = int(hashed_password.split("$")[2])
+    except (IndexError, ValueError):
+        return True
+    return rounds < BCRYPT_ROUNDS
+
+
+async def _run_in_hash_pool(fn, *args):
+    # Only touched from the event loop thread, so a plain counter is enough
+    global _hash_in_flight
+    if _hash_in_flight >= HASH_WORKERS + HASH_QUEUE_LIMIT:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many logins in progress, please try again.",
+            headers={"Retry-After": "1"},
+        )
+    _hash_in_flight += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(
+            _hash_pool, fn, *args
+        )
+    finally:
+        _hash_in_flight -= 1
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_in_hash_pool(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_in_hash_pool(verify_password, plain_password, hashed_password)
+
+
+def _sign(message: str) -> str:
+    digest = hmac.new(SECRET_KEY.encode(), message.encode(), hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest).decode().rstrip("=")
+
+
+def create_session_token(user_id: int) -> str:
+    """`<user_id>.<expires_at>.<signature>`, valid for SESSION_TTL_SECONDS."""
+    message = f"{user_id}.{int(time.time()) + SESSION_TTL_SECONDS}"
+    return f"{message}.{_sign(message)}"
+
+
+def read_session_token(token: str):
+    """Returns the user id of a valid, unexpired token, otherwise None."""
+    try:
+        user_id, expires_at, signature = token.split(".")
+        # compare_digest only takes ASCII str, and cookies can hold anything
+        expected = _sign(f"{user_id}.{expires_at}")
+        if not hmac.compare_digest(signature.encode(), expected.encode()):
+            return None
+        if int(expires_at) < time.time():
+            return None
+        return int(user_id)
+    except ValueError:
+        return None
+
+
+def invalidate_user_on_commit(db, user_id: int):
+    """Drops the cached copy of a user once the current transaction commits."""
+    db.info.setdefault("stale_user_ids", set()).add(user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _drop_stale_users(session):
+    for user_id in session.info.pop("stale_user_ids", ()):
+        user_cache.pop(user_id)
+
+
+def _on_user_changed(payload):
+    # A write committed by another worker; None means some may have been missed
+    if payload is None:
+        user_cache.clear()
+    else:
+        user_cache.pop(int(payload))
+
+
+broker.on(USER_CHANNEL, _on_user_changed)
+
+
+async def get_current_user(
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> User:
     """
-    Reads `user_id` from an HTTP-only cookie, fetches the User from the DB,
-    and raises 401 if missing/invalid.
+    Reads the signed session token from an HTTP-only cookie and returns its
+    User, from the in-process cache when possible, otherwise from the DB.
+    Raises 401 if the token is missing/invalid/expired or the user is gone.
+    Cached users come back as detached User objects: read their columns,
+    but don't add them to a session.
     """
-    user_id = request.cookies.get("user_id")
-    if not user_id:
+    token = request.cookies.get(SESSION_COOKIE)
+    if not token:
         raise HTTPException(status_code=401, detail="Not authenticated")
-    user = db.query(User).get(int(user_id))
+    user_id = read_session_token(token)
+    if user_id is None:
+        raise HTTPException(status_code=401, detail="Invalid session")
+
+    cached = user_cache.get(user_id)
+    if cached is not None:
+        return User(**cached)
+
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid user")
+    user_cache.set(user_id, {name: getattr(user, name) for name in USER_CACHE_COLUMNS})
     return user
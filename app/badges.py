@@ -0,0 +1,53 @@
+from functools import lru_cache
+
+# A badge is earned every BADGE_STEP points
+BADGE_STEP = 10
+
+# The named badges, one per step up to 100 points
+NAMED_BADGES = (
+    ("Getting Started", "Earned your first 10 points", "🌱"),
+    ("On Track", "Reached 20 points", "🚀"),
+    ("Consistent", "Reached 30 points", "⭐"),
+    ("Dedicated", "Reached 40 points", "💪"),
+    ("Achiever", "Reached 50 points", "🏆"),
+    ("Champion", "Reached 60 points", "👑"),
+    ("Master", "Reached 70 points", "🎯"),
+    ("Legend", "Reached 80 points", "💎"),
+    ("Elite", "Reached 90 points", "🔥"),
+    ("Ultimate", "Reached 100 points", "⚡"),
+)
+
+
+@lru_cache(maxsize=1024)
+def badge_for(threshold: int) -> dict:
+    """
+    The badge earned at `threshold` points (a positive multiple of
+    BADGE_STEP). Past the named badges a "Superstar" badge follows every step.
+    Treat the returned dict as read-only; it is shared.
+    """
+    level = threshold // BADGE_STEP
+    if level <= len(NAMED_BADGES):
+        name, description, emoji = NAMED_BADGES[level - 1]
+    else:
+        # Numbered as they always have been, from "Superstar 2" at 110
+        # points, so stored badge names keep matching
+        name = f"Superstar {level - len(NAMED_BADGES) + 1}"
+        description = f"Reached {threshold} points"
+        emoji = "🌟"
+    return {
+        "name": name,
+        "description": description,
+        "points": threshold,
+        "emoji": emoji,
+    }
+
+
+def thresholds_crossed(old_points: int, new_points: int) -> range:
+    """Badge thresholds in (old_points, new_points]; only as long as the gain."""
+    first = (max(old_points, 0) // BADGE_STEP + 1) * BADGE_STEP
+    return range(first, new_points + 1, BADGE_STEP)
+
+
+def next_badge(points: int) -> dict:
+    """The next badge the user is working towards."""
+    return badge_for((max(points, 0) // BADGE_STEP + 1) * BADGE_STEP)
@@ -0,0 +1,61 @@
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    Small in-process LRU cache whose entries also expire `ttl` seconds after
+    they were stored. With `maxbytes`, least recently used entries are also
+    evicted once the `sizeof` of all values exceeds that budget. There is no
+    locking: each call is a single dict operation, which is safe enough for
+    the threadpool under the GIL.
+    """
+
+    def __init__(
+        self, maxsize: int, ttl: float, clock=time.monotonic, maxbytes=None, sizeof=None
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.maxbytes = maxbytes
+        self.sizeof = sizeof or (lambda value: 0)
+        self.nbytes = 0
+        self._data = OrderedDict()
+
+    def get(self, key, default=None):
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        expires_at, value, _ = entry
+        if expires_at <= self.clock():
+            self.pop(key)
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key, value):
+        self.pop(key)
+        size = self.sizeof(value)
+        if self.maxbytes is not None and size > self.maxbytes:
+            return  # would evict everything else and still not fit
+        self._data[key] = (self.clock() + self.ttl, value, size)
+        self.nbytes += size
+        while len(self._data) > self.maxsize or (
+            self.maxbytes is not None and self.nbytes > self.maxbytes
+        ):
+            _, (_, _, evicted_size) = self._data.popitem(last=False)
+            self.nbytes -= evicted_size
+
+    def pop(self, key):
+        entry = self._data.pop(key, None)
+        if entry is None:
+            return None
+        self.nbytes -= entry[2]
+        return entry[1]
+
+    def clear(self):
+        self._data.clear()
+        self.nbytes = 0
+
+    def __len__(self):
+        return len(self._data)
@@ -0,0 +1,136 @@
+from datetime import datetime
+
+from sqlalchemy import JSON, func, literal_column, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+
+from app.models import ApplicationLog, Badge, Reminder, User, WatchlistItem
+from app.streaks import checkin_today_utc, streaks_query
+
+# Rows shown per dashboard section; older rows go through the paginated APIs
+RECENT_LIMIT = 10
+
+
+def _count(model, user_id: int):
+    return (
+        select(func.count())
+        .select_from(model)
+        .where(model.user_id == user_id)
+        .scalar_subquery()
+    )
+
+
+def _recent(columns, where, order_by, limit: int):
+    """
+    The first `limit` rows of a per-user query as a JSON array of objects.
+    Each row carries its position as "n" so json_agg keeps the order.
+    """
+    rows = (
+        select(*columns, func.row_number().over(order_by=order_by).label("n"))
+        .where(where)
+        .order_by(*order_by)
+        .limit(limit)
+        .subquery()
+    )
+    return (
+        select(
+            func.coalesce(
+                func.json_agg(aggregate_order_by(rows.table_valued(), rows.c.n)),
+                literal_column("'[]'::json"),
+                type_=JSON,
+            )
+        )
+        .select_from(rows)
+        .scalar_subquery()
+    )
+
+
+def _parse_timestamp(value: str) -> datetime:
+    """
+    Parses a timestamp as json_agg writes it. Postgres trims trailing zeros
+    off the fraction ("12:00:05.12"), which fromisoformat only accepts from
+    Python 3.11, so the fraction is padded to microseconds first.
+    """
+    stamp, dot, fraction = value.partition(".")
+    if dot:
+        stamp = f"{stamp}.{fraction:0<6}"
+    return datetime.fromisoformat(stamp)
+
+
+def _parse_datetimes(rows, *fields):
+    for row in rows:
+        for field in fields:
+            if row.get(field):
+                row[field] = _parse_timestamp(row[field])
+    return rows
+
+
+def dashboard_query(user_id: int, limit: int = RECENT_LIMIT):
+    """
+    One SELECT returning the user's points, per-section counts, the latest
+    `limit` rows of each section and the check-in streaks. Every part is an
+    index range scan on (user_id, ...), so the cost barely grows with a
+    user's history. The calendar loads its own range from
+    /api/calendar/events.
+    """
+    streaks = streaks_query(user_id, checkin_today_utc()).subquery()
+    return select(
+        select(User.points).where(User.id == user_id).scalar_subquery().label("points"),
+        _count(WatchlistItem, user_id).label("watchlist_count"),
+        _count(ApplicationLog, user_id).label("application_count"),
+        _count(Badge, user_id).label("badge_count"),
+        _count(Reminder, user_id).label("reminder_count"),
+        _recent(
+            [WatchlistItem.id, WatchlistItem.company_name, WatchlistItem.added_at],
+            WatchlistItem.user_id == user_id,
+            [WatchlistItem.added_at.desc(), WatchlistItem.id.desc()],
+            limit,
+        ).label("watchlist"),
+        _recent(
+            [
+                ApplicationLog.id,
+                ApplicationLog.company,
+                ApplicationLog.role,
+                ApplicationLog.status,
+                ApplicationLog.date_applied,
+            ],
+            ApplicationLog.user_id == user_id,
+            [ApplicationLog.date_applied.desc(), ApplicationLog.id.desc()],
+            limit,
+        ).label("application_logs"),
+        _recent(
+            [
+                Badge.id,
+                Badge.badge_name,
+                Badge.badge_description,
+                Badge.points_required,
+                Badge.earned_at,
+            ],
+            Badge.user_id == user_id,
+            [Badge.earned_at.desc(), Badge.id.desc()],
+            limit,
+        ).label("badges"),
+        _recent(
+            [Reminder.id, Reminder.company, Reminder.role, Reminder.due_date],
+            Reminder.user_id == user_id,
+            [Reminder.due_date.asc(), Reminder.id.asc()],
+            limit,
+        ).label("reminders"),
+        select(
+            func.json_build_object(
+                "current", streaks.c.current, "longest", streaks.c.longest, type_=JSON
+            )
+        )
+        .scalar_subquery()
+        .label("streaks"),
+    )
+
+
+async def load_dashboard(db, user_id: int, limit: int = RECENT_LIMIT) -> dict:
+    """Everything /dashboard renders, fetched in a single round trip."""
+    row = (await db.execute(dashboard_query(user_id, limit))).one()._asdict()
+    _parse_datetimes(row["watchlist"], "added_at")
+    _parse_datetimes(row["application_logs"], "date_applied")
+    _parse_datetimes(row["badges"], "earned_at")
+    _parse_datetimes(row["reminders"], "due_date")
+    row["points"] = row["points"] or 0
+    return row
@@ -1,8 +1,16 @@
 import os
+import threading
+import time
+import uuid
 
 from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+from starlette.concurrency import run_in_threadpool
 
 from dotenv import load_dotenv
 
@@ -15,9 +23,178 @@ DATABASE_URL = os.getenv(
     "DATABASE_URL", "postgresql://myuser:mypassword@db:5432/aspirelink_db"
 )
 
-engine = create_engine(DATABASE_URL)
+# How request handlers talk to Postgres:
+#   "sync"  - psycopg2 Session, every call run in the threadpool (default)
+#   "async" - SQLAlchemy asyncio with asyncpg, no threads involved
+DB_MODE = os.getenv("DB_MODE", "sync")
+
+
+def env_flag(name: str, default: str = "false") -> bool:
+    return os.getenv(name, default).strip().lower() in ("1", "true", "yes", "on")
+
+
+# Connection pool settings, per engine and per worker process
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+# Seconds before a connection is replaced; keeps us under server/proxy idle limits
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+# Test connections on checkout so a Postgres restart doesn't surface as errors
+DB_POOL_PRE_PING = env_flag("DB_POOL_PRE_PING", "true")
+# Behind PgBouncer in transaction mode: let PgBouncer do the pooling and
+# don't rely on server-side prepared statements surviving between queries
+DB_PGBOUNCER = env_flag("DB_PGBOUNCER")
+# Where the LISTEN connection (app/events.py) goes, when not DATABASE_URL.
+# LISTEN needs a session of its own, which PgBouncer in transaction mode
+# doesn't give, so with DB_PGBOUNCER point this straight at Postgres
+DB_LISTEN_URL = os.getenv("DB_LISTEN_URL") or None
+
+# Upper bounds (seconds) of the checkout wait histogram buckets
+CHECKOUT_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+def with_driver(url: str, driver: str) -> str:
+    """Pins the DBAPI driver unless the URL already names one."""
+    parsed = make_url(url)
+    if parsed.drivername == "postgresql":
+        parsed = parsed.set(drivername=f"postgresql+{driver}")
+    return parsed.render_as_string(hide_password=False)
+
+
+class PoolMetrics:
+    """Checkout counters and wait-time histogram for one engine's pool."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pool = None
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_sum = 0.0
+        self.wait_max = 0.0
+        self.bucket_counts = [0] * len(CHECKOUT_WAIT_BUCKETS)
+
+    def observe(self, waited: float):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_sum += waited
+            self.wait_max = max(self.wait_max, waited)
+            for i, bound in enumerate(CHECKOUT_WAIT_BUCKETS):
+                if waited <= bound:
+                    self.bucket_counts[i] += 1
+
+    def observe_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def usage(self) -> dict:
+        """Current size/in-use/overflow, for pools that keep connections."""
+        pool = self.pool
+        if not isinstance(pool, QueuePool):
+            return {}
+        return {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+        }
+
+
+class TimedPoolMixin:
+    """Times every checkout, including waits for a free connection."""
+
+    metrics: PoolMetrics
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics.pool = self  # follows the pool across dispose()/recreate()
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.metrics.observe_timeout()
+            raise
+        self.metrics.observe(time.perf_counter() - started)
+        return connection
+
+
+pool_metrics = []
+
+
+def timed_pool(base, name: str):
+    metrics = PoolMetrics(name)
+    pool_metrics.append(metrics)
+    return type(f"Timed{base.__name__}", (TimedPoolMixin, base), {"metrics": metrics})
+
+
+def engine_options(name: str, queue_pool) -> dict:
+    """create_engine()/create_async_engine() keyword arguments from the env."""
+    if DB_PGBOUNCER:
+        return {"poolclass": timed_pool(NullPool, name)}
+    return {
+        "poolclass": timed_pool(queue_pool, name),
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+
+def render_pool_metrics() -> str:
+    """Pool metrics in the Prometheus text exposition format."""
+    lines = [
+        "# TYPE db_pool_connections gauge",
+        "# TYPE db_pool_checkout_wait_seconds histogram",
+        "# TYPE db_pool_checkout_wait_seconds_max gauge",
+        "# TYPE db_pool_checkout_timeouts_total counter",
+    ]
+    for metrics in pool_metrics:
+        label = f'engine="{metrics.name}"'
+        for state, value in metrics.usage().items():
+            lines.append(f'db_pool_connections{{{label},state="{state}"}} {value}')
+        with metrics._lock:
+            for bound, count in zip(CHECKOUT_WAIT_BUCKETS, metrics.bucket_counts):
+                lines.append(
+                    f'db_pool_checkout_wait_seconds_bucket{{{label},le="{bound}"}} {count}'
+                )
+            lines += [
+                f'db_pool_checkout_wait_seconds_bucket{{{label},le="+Inf"}} {metrics.checkouts}',
+                f"db_pool_checkout_wait_seconds_sum{{{label}}} {metrics.wait_sum:.6f}",
+                f"db_pool_checkout_wait_seconds_count{{{label}}} {metrics.checkouts}",
+                f"db_pool_checkout_wait_seconds_max{{{label}}} {metrics.wait_max:.6f}",
+                f"db_pool_checkout_timeouts_total{{{label}}} {metrics.timeouts}",
+            ]
+    return "\n".join(lines) + "\n"
+
+
+# The synchronous engine is always available: scripts, migrations and the
+# notification listener use it regardless of DB_MODE
+engine = create_engine(
+    with_driver(DATABASE_URL, "psycopg2"), **engine_options("sync", QueuePool)
+)
 SessionLocal = sessionmaker(bind=engine)
 
+async_engine = None
+AsyncSessionLocal = None
+if DB_MODE == "async":
+    async_options = engine_options("async", AsyncAdaptedQueuePool)
+    if DB_PGBOUNCER:
+        # asyncpg prepares every statement; PgBouncer may hand the next query
+        # to another server connection, so disable both statement caches and
+        # give each prepared statement a unique name
+        async_options["connect_args"] = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+        }
+    async_engine = create_async_engine(
+        with_driver(DATABASE_URL, "asyncpg"), **async_options
+    )
+    AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
 Base = declarative_base()
 
 
@@ -27,9 +204,74 @@ def init_db():
     Base.metadata.create_all(bind=engine)
 
 
-def get_db():
-    db: Session = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+class ThreadedSession:
+    """
+    Gives a synchronous Session the awaitable interface of AsyncSession by
+    running each database call in the threadpool, so handlers are written
+    once and never block the event loop in either DB_MODE.
+    """
+
+    def __init__(self, session: Session):
+        self.sync_session = session
+
+    @property
+    def info(self):
+        return self.sync_session.info
+
+    def add(self, instance):
+        self.sync_session.add(instance)
+
+    def add_all(self, instances):
+        self.sync_session.add_all(instances)
+
+    async def execute(self, statement, *args, **kwargs):
+        return await run_in_threadpool(
+            self.sync_session.execute, statement, *args, **kwargs
+        )
+
+    async def scalar(self, statement, *args, **kwargs):
+        return await run_in_threadpool(
+            self.sync_session.scalar, statement, *args, **kwargs
+        )
+
+    async def scalars(self, statement, *args, **kwargs):
+        return await run_in_threadpool(
+            self.sync_session.scalars, statement, *args, **kwargs
+        )
+
+    async def get(self, entity, ident, **kwargs):
+        return await run_in_threadpool(self.sync_session.get, entity, ident, **kwargs)
+
+    async def delete(self, instance):
+        await run_in_threadpool(self.sync_session.delete, instance)
+
+    async def flush(self):
+        await run_in_threadpool(self.sync_session.flush)
+
+    async def refresh(self, instance, *args, **kwargs):
+        await run_in_threadpool(self.sync_session.refresh, instance, *args, **kwargs)
+
+    async def commit(self):
+        await run_in_threadpool(self.sync_session.commit)
+
+    async def rollback(self):
+        await run_in_threadpool(self.sync_session.rollback)
+
+    async def close(self):
+        await run_in_threadpool(self.sync_session.close)
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return await run_in_threadpool(fn, self.sync_session, *args, **kwargs)
+
+
+async def get_db():
+    """Yields an AsyncSession, or a ThreadedSession when DB_MODE is "sync"."""
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as db:
+            yield db
+    else:
+        db = ThreadedSession(SessionLocal(expire_on_commit=False))
+        try:
+            yield db
+        finally:
+            await db.close()
@@ -0,0 +1,134 @@
+import asyncio
+
+import psycopg2
+from sqlalchemy.engine import make_url
+
+from app.db import DB_LISTEN_URL, DB_PGBOUNCER, engine
+
+# Postgres NOTIFY channel the fetcher signals after writing new listings
+INGEST_CHANNEL = "internships_ingested"
+# Signalled (payload: user id) when a transaction changed a user's data, so
+# every worker can drop what it cached for that user
+USER_CHANNEL = "user_data_changed"
+# Signalled (payload: "<old points> <new points>") by every points award
+POINTS_CHANNEL = "points_changed"
+# Signalled (payload: user id) by the reminder scheduler for every user it
+# queued due-soon reminder notifications for
+REMINDER_CHANNEL = "reminders_due"
+
+# Channels forwarded to SSE clients, and the event name each is sent as
+INGEST_EVENT = "ingest"
+REMINDER_EVENT = "reminder"
+STREAM_EVENTS = {INGEST_CHANNEL: INGEST_EVENT, REMINDER_CHANNEL: REMINDER_EVENT}
+
+# Seconds to wait before reconnecting the LISTEN connection
+RECONNECT_DELAY = 5
+
+
+class NotificationBroker:
+    """
+    Holds one LISTEN connection per process and fans every NOTIFY out to the
+    connected SSE clients, so open dashboards cost nothing on the database
+    until ingest actually signals new data. Other modules can also register
+    callbacks for any channel with `on()`.
+    """
+
+    def __init__(self, events: dict = STREAM_EVENTS):
+        self.events = events
+        self._subscribers = set()
+        self._handlers = {}
+        self._task = None
+
+    def on(self, channel: str, callback):
+        """
+        Calls `callback(payload)` for every NOTIFY on `channel`, and
+        `callback(None)` after (re)connecting, since notifications sent while
+        disconnected are lost.
+        """
+        self._handlers.setdefault(channel, []).append(callback)
+
+    def _dispatch(self, channel: str, payload):
+        for callback in self._handlers.get(channel, ()):
+            try:
+                callback(payload)
+            except Exception as e:
+                print(f"Error handling {channel} notification: {e}", flush=True)
+        if channel in self.events and payload is not None:
+            self.publish(self.events[channel], payload)
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=16)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+
+    def publish(self, event: str, payload: str):
+        for queue in self._subscribers:
+            try:
+                queue.put_nowait((event, payload))
+            except asyncio.QueueFull:
+                pass  # slow client; it will catch up on the next event
+
+    def start(self):
+        if DB_PGBOUNCER and not DB_LISTEN_URL:
+            print(
+                "Warning: DB_PGBOUNCER is set without DB_LISTEN_URL; LISTEN through "
+                "a transaction-mode pooler receives no notifications",
+                flush=True,
+            )
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._listen())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _connect(self):
+        url = make_url(DB_LISTEN_URL) if DB_LISTEN_URL else engine.url
+        dsn = url.set(drivername="postgresql").render_as_string(hide_password=False)
+        conn = psycopg2.connect(dsn)
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            for channel in {*self.events, *self._handlers}:
+                cursor.execute(f'LISTEN "{channel}"')
+        return conn
+
+    async def _listen(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                conn = await asyncio.to_thread(self._connect)
+            except Exception as e:
+                print(f"Error connecting notification listener: {e}", flush=True)
+                await asyncio.sleep(RECONNECT_DELAY)
+                continue
+
+            for channel in list(self._handlers):
+                self._dispatch(channel, None)
+
+            readable = asyncio.Event()
+            loop.add_reader(conn.fileno(), readable.set)
+            try:
+                while True:
+                    await readable.wait()
+                    readable.clear()
+                    conn.poll()
+                    while conn.notifies:
+                        notify = conn.notifies.pop(0)
+                        self._dispatch(notify.channel, notify.payload)
+            except psycopg2.Error as e:
+                print(f"Notification listener lost connection: {e}", flush=True)
+            finally:
+                loop.remove_reader(conn.fileno())
+                conn.close()
+            await asyncio.sleep(RECONNECT_DELAY)
+
+
+broker = NotificationBroker()
@@ -0,0 +1,124 @@
+import os
+import re
+from datetime import datetime, timedelta
+
+from sqlalchemy import or_, text, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models import Internship, InternshipHistory
+
+FIRST_SEEN = "first_seen"
+ACTIVATED = "activated"
+DEACTIVATED = "deactivated"
+HISTORY_EVENTS = (FIRST_SEEN, ACTIVATED, DEACTIVATED)
+
+# Monthly history partitions older than this many months are dropped
+HISTORY_RETENTION_MONTHS = int(os.getenv("HISTORY_RETENTION_MONTHS", "12"))
+
+# Unchanged postings get last_seen_at rewritten at most this often, so an
+# ingest of an unchanged feed stays (nearly) write-free
+LAST_SEEN_RESOLUTION = timedelta(
+    hours=float(os.getenv("LAST_SEEN_RESOLUTION_HOURS", "24"))
+)
+
+_PARTITION_NAME = re.compile(r"^internship_history_p(\d{4})(\d{2})$")
+
+# Partitions this process has already created
+_partitions = set()
+
+
+def month_start(moment: datetime) -> datetime:
+    return datetime(moment.year, moment.month, 1)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f"internship_history_p{month:%Y%m}"
+
+
+def maintain_history_partitions(db: Session, now: datetime, ahead: int = 1):
+    """
+    Creates the monthly partitions from now's month through `ahead` months
+    later and drops those past HISTORY_RETENTION_MONTHS. Commits, so the
+    partitions exist before any transaction writes history into them.
+    """
+    month = month_start(now)
+    wanted = [add_months(month, n) for n in range(ahead + 1)]
+    created = []
+    for start in wanted:
+        name = partition_name(start)
+        if name in _partitions:
+            continue
+        db.execute(
+            text(
+                f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF internship_history '
+                f"FOR VALUES FROM ('{start:%Y-%m-%d}') TO ('{add_months(start, 1):%Y-%m-%d}')"
+            )
+        )
+        created.append(name)
+    if created:
+        oldest_kept = add_months(month, -HISTORY_RETENTION_MONTHS)
+        partitions = db.scalars(
+            text(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = 'internship_history'::regclass"
+            )
+        ).all()
+        for name in partitions:
+            match = _PARTITION_NAME.match(name)
+            if match and datetime(int(match[1]), int(match[2]), 1) < oldest_kept:
+                db.execute(text(f'DROP TABLE IF EXISTS "{name}"'))
+    db.commit()
+    _partitions.update(created)
+
+
+def history_events(old_active: dict, rows, at: datetime, source=None):
+    """
+    The history rows for internship rows just written, given {id: active}
+    as it was before the write; ids missing from it were new postings.
+    """
+    events = []
+    for row in rows:
+        if row["id"] not in old_active:
+            event = FIRST_SEEN
+        elif bool(old_active[row["id"]]) != bool(row["active"]):
+            event = ACTIVATED if row["active"] else DEACTIVATED
+        else:
+            continue
+        events.append(
+            {
+                "internship_id": row["id"],
+                "event": event,
+                "occurred_at": at,
+                "source": source,
+            }
+        )
+    return events
+
+
+def record_history(db: Session, events):
+    if events:
+        db.execute(insert(InternshipHistory).values(events))
+
+
+def mark_seen(db: Session, internship_ids, now: datetime):
+    """Moves last_seen_at forward for unchanged postings, once per LAST_SEEN_RESOLUTION."""
+    if not internship_ids:
+        return
+    db.execute(
+        update(Internship)
+        .where(Internship.id.in_(internship_ids))
+        .where(
+            or_(
+                Internship.last_seen_at.is_(None),
+                Internship.last_seen_at < now - LAST_SEEN_RESOLUTION,
+            )
+        )
+        .values(last_seen_at=now)
+    )
@@ -0,0 +1,113 @@
+import asyncio
+import os
+import time
+
+from sqlalchemy import func, select
+
+from app.events import POINTS_CHANNEL, broker
+from app.models import User
+
+# The ranking is rebuilt from the database at least this often, which also
+# picks up new users and any point change whose notification was missed
+RANKING_REBUILD_SECONDS = float(os.getenv("RANKING_REBUILD_SECONDS", "300"))
+
+
+class FenwickTree:
+    """Counts per non-negative integer key with O(log n) update and prefix sum."""
+
+    def __init__(self, size: int = 1024):
+        self.size = size
+        self.tree = [0] * (size + 1)
+        self.total = 0
+
+    def add(self, key: int, count: int):
+        if key >= self.size:
+            self._grow(key)
+        self.total += count
+        i = key + 1
+        while i <= self.size:
+            self.tree[i] += count
+            i += i & -i
+
+    def prefix(self, key: int) -> int:
+        """Sum of counts for keys <= key."""
+        i = min(key + 1, self.size)
+        result = 0
+        while i > 0:
+            result += self.tree[i]
+            i -= i & -i
+        return result
+
+    def _grow(self, key: int):
+        counts = [self.prefix(k) - self.prefix(k - 1) for k in range(self.size)]
+        size = self.size
+        while size <= key:
+            size *= 2
+        self.__init__(size)
+        for k, count in enumerate(counts):
+            if count:
+                self.add(k, count)
+
+
+class Ranking:
+    """
+    Number of users at each point total, so a rank is one prefix sum instead
+    of a sort over users. Built from a GROUP BY (index-only scan on points)
+    and kept current from the points NOTIFY that every award sends.
+    """
+
+    def __init__(self):
+        self.tree = None
+        self.built_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def ensure_loaded(self, db) -> FenwickTree:
+        """
+        The current tree, rebuilt first if missing or stale. Rank against the
+        returned tree: self.tree can be dropped for a rebuild by a points
+        notification arriving while the caller awaits other queries.
+        """
+        tree = self.tree
+        if tree is not None and time.monotonic() - self.built_at < RANKING_REBUILD_SECONDS:
+            return tree
+        async with self._lock:
+            tree = self.tree
+            if tree is not None and time.monotonic() - self.built_at < RANKING_REBUILD_SECONDS:
+                return tree
+            rows = (
+                await db.execute(
+                    select(User.points, func.count()).group_by(User.points)
+                )
+            ).all()
+            tree = FenwickTree()
+            for points, count in rows:
+                tree.add(max(points or 0, 0), count)
+            self.tree = tree
+            self.built_at = time.monotonic()
+            return tree
+
+    def rank(self, points: int, tree: FenwickTree = None) -> int:
+        """
+        1 + the number of users with more points; ties share a rank. Pass
+        the tree ensure_loaded returned, or self.tree is used.
+        """
+        if tree is None:
+            tree = self.tree
+        points = max(points or 0, 0)
+        return 1 + tree.total - tree.prefix(points)
+
+    def on_points_changed(self, payload):
+        """Payload "<old> <new>" moves one user; anything else forces a rebuild."""
+        if self.tree is None:
+            return
+        try:
+            old, new = (int(value) for value in payload.split())
+        except (AttributeError, ValueError):
+            self.tree = None
+            return
+        self.tree.add(max(old, 0), -1)
+        self.tree.add(max(new, 0), 1)
+
+
+ranking = Ranking()
+broker.on(POINTS_CHANNEL, ranking.on_points_changed)
@@ -1,12 +1,24 @@
 import os
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 
 from app.api import router  # all routes (including /dashboard & /profile) live here
+from app.events import broker
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Listen for ingest notifications and push them to SSE clients
+    broker.start()
+    yield
+    await broker.stop()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # Serve your CSS/JS under /static
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
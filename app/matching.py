@@ -0,0 +1,143 @@
+import re
+
+from sqlalchemy import and_, delete, exists, func, literal, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert
+from sqlalchemy.orm import Session
+
+from app.models import (
+    Company,
+    Internship,
+    Notification,
+    WatchlistItem,
+    WatchlistMatch,
+)
+
+_NON_ALNUM = re.compile(r"[\W_]+")
+
+
+def normalize_company(name: str) -> str:
+    """
+    Key used to match watchlist entries to internships: lower case, with runs
+    of punctuation/whitespace collapsed to one space ("Jane Street, LLC" ->
+    "jane street llc"). Mirrored by the backfill in the migration that added
+    the company_key columns.
+    """
+    return _NON_ALNUM.sub(" ", (name or "").lower()).strip()
+
+
+def refresh_matches_for_internships(db: Session, internship_ids):
+    """
+    Brings watchlist_matches up to date for internships that were just
+    inserted or updated by ingest: drops matches whose company changed and
+    adds one row per watchlist entry with the same company key. Newly added
+    matches for active internships are also queued as notifications.
+    """
+    if not internship_ids:
+        return
+    db.execute(
+        delete(WatchlistMatch)
+        .where(WatchlistMatch.internship_id.in_(internship_ids))
+        .where(
+            WatchlistMatch.internship_id == Internship.id,
+            WatchlistMatch.company_key != Internship.company_key,
+        )
+    )
+    matches = (
+        select(WatchlistItem.user_id, Internship.id, Internship.company_key)
+        .join(WatchlistItem, WatchlistItem.company_key == Internship.company_key)
+        .where(Internship.id.in_(internship_ids))
+    )
+    new_matches = (
+        insert(WatchlistMatch)
+        .from_select(["user_id", "internship_id", "company_key"], matches)
+        .on_conflict_do_nothing()
+        .returning(WatchlistMatch.user_id, WatchlistMatch.internship_id)
+        .cte("new_matches")
+    )
+    # Matches that did not exist before go to the users' notification outbox
+    db.execute(
+        insert(Notification)
+        .from_select(
+            ["user_id", "internship_id"],
+            select(new_matches.c.user_id, new_matches.c.internship_id)
+            .join(Internship, Internship.id == new_matches.c.internship_id)
+            .where(Internship.active == True),
+        )
+        .on_conflict_do_nothing()
+        .add_cte(new_matches)
+    )
+
+
+def add_matches_for_company(db: Session, user_id: int, company_key: str):
+    """Matches every existing internship of a company newly added to a watchlist."""
+    matches = select(
+        literal(user_id), Internship.id, Internship.company_key
+    ).where(Internship.company_key == company_key)
+    db.execute(
+        insert(WatchlistMatch)
+        .from_select(["user_id", "internship_id", "company_key"], matches)
+        .on_conflict_do_nothing()
+    )
+
+
+def remove_matches_for_company(db: Session, user_id: int, company_key: str):
+    """Drops a user's matches for a company once no watchlist entry still maps to it."""
+    db.execute(
+        delete(WatchlistMatch).where(
+            WatchlistMatch.user_id == user_id,
+            WatchlistMatch.company_key == company_key,
+            ~exists().where(
+                and_(
+                    WatchlistItem.user_id == user_id,
+                    WatchlistItem.company_key == company_key,
+                )
+            ),
+        )
+    )
+
+
+def refresh_companies(db: Session, company_keys=None):
+    """
+    Recomputes the companies rows for `company_keys` (all when None) from
+    internships, and drops companies left without postings. Ingest passes
+    the old and new keys of every row it inserted or updated.
+    """
+    if company_keys is not None and not company_keys:
+        return
+    latest_name = func.array_agg(
+        aggregate_order_by(
+            Internship.company, Internship.date_posted.desc().nulls_last()
+        )
+    )[1]
+    stats = (
+        select(
+            Internship.company_key,
+            latest_name,
+            func.count().filter(Internship.active == True),
+            func.max(Internship.date_posted),
+        )
+        .where(Internship.company_key.isnot(None))
+        .group_by(Internship.company_key)
+    )
+    # compare in the default collation so the internships index is used
+    gone = delete(Company).where(
+        ~exists().where(Internship.company_key == Company.key.collate("default"))
+    )
+    if company_keys is not None:
+        stats = stats.where(Internship.company_key.in_(company_keys))
+        gone = gone.where(Company.key.in_(company_keys))
+
+    stmt = insert(Company).from_select(
+        ["key", "name", "active_count", "latest_posted"], stats
+    )
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[Company.key],
+            set_={
+                "name": stmt.excluded.name,
+                "active_count": stmt.excluded.active_count,
+                "latest_posted": stmt.excluded.latest_posted,
+            },
+        )
+    )
+    db.execute(gone)
@@ -1,25 +1,43 @@
 from sqlalchemy import (
+    DDL,
+    BigInteger,
     Column,
+    Computed,
     Integer,
+    Index,
     String,
     Boolean,
+    Date,
     DateTime,
     ForeignKey,
     UniqueConstraint,
+    desc,
+    event,
 )
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 from app.db import Base
 
 
+def utcnow() -> datetime:
+    """
+    Naive UTC now. The timestamp columns are WITHOUT TIME ZONE, and asyncpg
+    refuses aware datetimes for them (psycopg2 silently drops the offset).
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 class User(Base):
     __tablename__ = "users"
+    # Leaderboard pages and neighbours, walked from either end
+    __table_args__ = (Index("ix_users_points_id", "points", "id"),)
 
     id = Column(Integer, primary_key=True)
     username = Column(String, nullable=False, unique=True)
     email = Column(String, nullable=False, unique=True)
     password_hash = Column(String, nullable=False)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    created_at = Column(DateTime, default=utcnow)
     points = Column(Integer, default=0)
 
     # relationships
@@ -40,59 +58,243 @@ class User(Base):
 
 class Internship(Base):
     __tablename__ = "internships"
+    __table_args__ = (
+        Index("ix_internships_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_internships_company_trgm",
+            "company",
+            postgresql_using="gin",
+            postgresql_ops={"company": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_internships_role_trgm",
+            "role",
+            postgresql_using="gin",
+            postgresql_ops={"role": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_internships_location_trgm",
+            "location",
+            postgresql_using="gin",
+            postgresql_ops={"location": "gin_trgm_ops"},
+        ),
+    )
+
     id = Column(String, primary_key=True)
     company = Column(String, nullable=False)
+    company_key = Column(String, index=True)  # normalize_company(company)
     role = Column(String, nullable=False)
     location = Column(String)
     remote = Column(Boolean, default=False)
     link = Column(String)
-    date_posted = Column(String)
+    date_posted = Column(DateTime)  # UTC, parsed from the feed's epoch seconds
     source = Column(String)
     is_visible = Column(Boolean)
     active = Column(Boolean)
     season = Column(String)
+    content_hash = Column(String)  # sha256 of the feed fields, see fetch_internships
+    # When ingest first and last saw the posting in a feed (naive UTC);
+    # last_seen_at is refreshed at most once per LAST_SEEN_RESOLUTION
+    first_seen_at = Column(DateTime, index=True, default=utcnow)
+    last_seen_at = Column(DateTime, default=utcnow)
+    search_vector = Column(
+        TSVECTOR,
+        Computed(
+            "to_tsvector('simple', coalesce(company, '') || ' ' || "
+            "coalesce(role, '') || ' ' || coalesce(location, ''))",
+            persisted=True,
+        ),
+    )
+
+
+# "Newest first" / "posted since" over active postings
+Index(
+    "ix_internships_active_date_posted",
+    Internship.date_posted.desc().nulls_last(),
+    Internship.id.desc(),
+    postgresql_where=Internship.active == True,
+)
+
+# The trigram indexes above need pg_trgm before the table is created
+event.listen(
+    Internship.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"),
+)
+
+
+class InternshipHistory(Base):
+    """
+    Append-only log of what ingest saw happen to each posting: first seen,
+    went inactive, came back. Range partitioned by month on occurred_at (see
+    app/history.py), so "since" queries only touch recent partitions and old
+    months are dropped whole.
+    """
+
+    __tablename__ = "internship_history"
+    __table_args__ = (
+        Index("ix_internship_history_event_occurred_at", "event", "occurred_at", "id"),
+        Index("ix_internship_history_internship_id", "internship_id", "occurred_at"),
+        {"postgresql_partition_by": "RANGE (occurred_at)"},
+    )
+
+    # The partition key has to be part of the primary key
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    occurred_at = Column(DateTime, primary_key=True)
+    # No foreign key: history outlives the rows it describes
+    internship_id = Column(String, nullable=False)
+    event = Column(String, nullable=False)  # see HISTORY_EVENTS
+    source = Column(String)  # name of the feed that reported it
+
+
+class FeedState(Base):
+    """Cache validators from the last successful fetch of a listings source."""
+
+    __tablename__ = "feed_state"
+
+    source = Column(String, primary_key=True)
+    etag = Column(String)
+    last_modified = Column(String)
+    fetched_at = Column(DateTime, default=utcnow)
+
+
+class Company(Base):
+    """
+    One row per company key across all internships, kept up to date by
+    ingest (see refresh_companies) so the watchlist page never scans
+    internships.
+    """
+
+    __tablename__ = "companies"
+
+    # normalize_company(name). "C" collation: keyset pages and prefix ranges
+    # run straight off the primary key index
+    key = Column(String(collation="C"), primary_key=True)
+    name = Column(String, nullable=False)  # as written on the latest posting
+    active_count = Column(Integer, nullable=False, default=0)
+    latest_posted = Column(DateTime)
 
 
 class WatchlistItem(Base):
     __tablename__ = "watchlist_items"
     __table_args__ = (
         UniqueConstraint("user_id", "company_name", name="uix_user_company"),
+        # Newest-first pages of a user's watchlist (/api/watchlist)
+        Index("ix_watchlist_items_user_id_added_at", "user_id", desc("added_at")),
     )
 
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     company_name = Column(String, nullable=False)
-    added_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    company_key = Column(String, index=True)  # normalize_company(company_name)
+    added_at = Column(DateTime, default=utcnow)
 
     user = relationship("User", back_populates="watchlist")
 
 
+class WatchlistMatch(Base):
+    """
+    Internships whose company key equals one of the user's watchlist keys.
+    Maintained by ingest and the watchlist endpoints (see app/matching.py).
+    """
+
+    __tablename__ = "watchlist_matches"
+
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    internship_id = Column(
+        String,
+        ForeignKey("internships.id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
+    )
+    company_key = Column(String, nullable=False)
+    matched_at = Column(DateTime, default=utcnow)
+
+
+class Notification(Base):
+    """
+    Per-user outbox: newly matched internships, written by ingest, and
+    reminders coming due, written by the reminder scheduler. Read in id
+    order past the user's NotificationCursor.
+    """
+
+    __tablename__ = "notifications"
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id", "internship_id", name="uix_notification_user_internship"
+        ),
+        UniqueConstraint(
+            "user_id", "reminder_id", name="uix_notification_user_reminder"
+        ),
+        Index("ix_notifications_user_id_id", "user_id", "id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    # "internship" or "reminder_due"; says which of the ids below is set
+    kind = Column(
+        String, nullable=False, default="internship", server_default="internship"
+    )
+    internship_id = Column(
+        String, ForeignKey("internships.id", ondelete="CASCADE"), nullable=True
+    )
+    reminder_id = Column(
+        Integer, ForeignKey("reminders.id", ondelete="CASCADE"), nullable=True
+    )
+    created_at = Column(DateTime, default=utcnow)
+
+
+class NotificationCursor(Base):
+    __tablename__ = "notification_cursors"
+
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    last_seen_id = Column(Integer, nullable=False, default=0)
+
+
 class ApplicationLog(Base):
     __tablename__ = "application_logs"
+    __table_args__ = (
+        Index("ix_application_logs_user_id_date_applied", "user_id", desc("date_applied")),
+    )
 
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     company = Column(String, nullable=False)
     role = Column(String, nullable=False)
     status = Column(String, nullable=False)
-    date_applied = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    date_applied = Column(DateTime, default=utcnow)
 
     user = relationship("User", back_populates="application_logs")
 
 
 class CheckIn(Base):
     __tablename__ = "checkins"
+    __table_args__ = (
+        Index("ix_checkins_user_id_date", "user_id", "date"),
+        # One check-in per user per (UTC) day; also serves streak queries
+        UniqueConstraint("user_id", "checkin_day", name="uix_checkin_user_day"),
+    )
 
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     note = Column(String, nullable=True)
-    date = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    date = Column(DateTime, default=utcnow)
+    checkin_day = Column(Date, nullable=False)  # UTC date of `date`
 
     user = relationship("User", back_populates="checkins")
 
 
 class Reminder(Base):
     __tablename__ = "reminders"
+    __table_args__ = (
+        Index("ix_reminders_user_id_due_date", "user_id", "due_date"),
+        # The reminder scheduler's window reads across all users
+        Index("ix_reminders_due_date", "due_date"),
+    )
 
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -104,14 +306,32 @@ class Reminder(Base):
     user = relationship("User", back_populates="reminders")
 
 
+class PointsLedger(Base):
+    """Append-only record of every points change; users.points is its running sum."""
+
+    __tablename__ = "points_ledger"
+    __table_args__ = (Index("ix_points_ledger_user_id_id", "user_id", "id"),)
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    delta = Column(Integer, nullable=False)
+    reason = Column(String, nullable=False)  # e.g. "checkin", "application_logged"
+    balance = Column(Integer, nullable=False)  # users.points after this entry
+    created_at = Column(DateTime, default=utcnow)
+
+
 class Badge(Base):
     __tablename__ = "badges"
+    __table_args__ = (
+        Index("ix_badges_user_id_earned_at", "user_id", desc("earned_at")),
+        UniqueConstraint("user_id", "points_required", name="uix_badge_user_points"),
+    )
 
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     badge_name = Column(String, nullable=False)
     badge_description = Column(String, nullable=False)
     points_required = Column(Integer, nullable=False)
-    earned_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    earned_at = Column(DateTime, default=utcnow)
 
     user = relationship("User", back_populates="badges")
@@ -0,0 +1,92 @@
+import os
+
+from fastapi.responses import HTMLResponse
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+from app.cache import TTLCache
+from app.db import env_flag
+from app.events import INGEST_CHANNEL, USER_CHANNEL, broker
+
+# Rendered pages kept per worker. Entries are keyed by the data versions they
+# were rendered from, so a write simply makes the old entries unreachable and
+# LRU / the memory budget reclaim them. The TTL bounds date-dependent content
+# such as "overdue" reminder labels.
+PAGE_CACHE_ENABLED = env_flag("PAGE_CACHE_ENABLED", "true")
+PAGE_CACHE_SIZE = int(os.getenv("PAGE_CACHE_SIZE", "5000"))
+PAGE_CACHE_BYTES = int(os.getenv("PAGE_CACHE_BYTES", str(32 * 1024 * 1024)))
+PAGE_CACHE_TTL_SECONDS = float(os.getenv("PAGE_CACHE_TTL_SECONDS", "300"))
+
+page_cache = TTLCache(
+    maxsize=PAGE_CACHE_SIZE,
+    ttl=PAGE_CACHE_TTL_SECONDS,
+    maxbytes=PAGE_CACHE_BYTES,
+    sizeof=len,
+)
+
+# Bumped on every committed write by that user
+_user_versions = {}
+# Bumped after ingest, and whenever notifications may have been missed
+_global_version = 0
+
+
+def bump_user_version(user_id: int):
+    _user_versions[user_id] = _user_versions.get(user_id, 0) + 1
+
+
+def bump_global_version():
+    global _global_version
+    _global_version += 1
+
+
+def page_key(user_id: int, path: str):
+    """
+    Cache key for a user's page at the current data versions. Take it before
+    loading any data: a write that commits while the page renders bumps the
+    version, so the page is stored under a key that is already stale.
+    """
+    return (user_id, path, _user_versions.get(user_id, 0), _global_version)
+
+
+def get_page(key):
+    if not PAGE_CACHE_ENABLED:
+        return None
+    body = page_cache.get(key)
+    if body is None:
+        return None
+    # Lets load tests tell cached responses from rendered ones
+    return HTMLResponse(content=body, headers={"X-Page-Cache": "hit"})
+
+
+def store_page(key, response):
+    if PAGE_CACHE_ENABLED and response.status_code == 200:
+        page_cache.set(key, bytes(response.body))
+    return response
+
+
+async def user_data_changed(db, user_id: int):
+    """
+    Invalidates the user's cached pages once the current transaction commits:
+    locally via the after_commit hook, and in other workers through a NOTIFY,
+    which Postgres only delivers if the transaction commits.
+    """
+    db.info.setdefault("changed_user_ids", set()).add(user_id)
+    await db.execute(select(func.pg_notify(USER_CHANNEL, str(user_id))))
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_changed_users(session):
+    for user_id in session.info.pop("changed_user_ids", ()):
+        bump_user_version(user_id)
+
+
+def _on_user_changed(payload):
+    if payload is None:
+        bump_global_version()
+    else:
+        bump_user_version(int(payload))
+
+
+broker.on(USER_CHANNEL, _on_user_changed)
+# Ingest rematches watchlists for many users at once
+broker.on(INGEST_CHANNEL, lambda payload: bump_global_version())
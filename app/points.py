@@ -0,0 +1,105 @@
+from sqlalchemy import func, literal, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.auth import invalidate_user_on_commit
+from app.badges import badge_for, thresholds_crossed
+from app.events import POINTS_CHANNEL
+from app.models import Badge, PointsLedger, User
+
+
+async def award_points(db, user: User, points: int, reason: str):
+    """
+    Adds points and records why in the ledger, in one statement: an atomic
+    UPDATE ... RETURNING (no re-read of the possibly cached user, no lost
+    increments between concurrent requests) feeding the ledger INSERT, whose
+    RETURNING also queues the leaderboard notification for commit.
+    Returns the badges earned.
+    """
+    total = (
+        update(User)
+        .where(User.id == user.id)
+        .values(points=func.coalesce(User.points, 0) + points)
+        .returning(User.points)
+        .cte("total")
+    )
+    balance = await db.scalar(
+        insert(PointsLedger)
+        .from_select(
+            ["user_id", "delta", "reason", "balance", "created_at"],
+            select(
+                literal(user.id),
+                literal(points),
+                literal(reason),
+                total.c.points,
+                func.timezone("utc", func.now()),
+            ),
+        )
+        .returning(
+            PointsLedger.balance,
+            func.pg_notify(
+                POINTS_CHANNEL,
+                func.concat(
+                    PointsLedger.balance - PointsLedger.delta,
+                    " ",
+                    PointsLedger.balance,
+                ),
+            ),
+        )
+        .add_cte(total)
+    )
+    # Reflect the new total without marking the row dirty for another UPDATE
+    set_committed_value(user, "points", balance)
+    invalidate_user_on_commit(db, user.id)
+    return await check_and_award_badges(db, user, balance - points)
+
+
+async def check_and_award_badges(db, user: User, old_points: int):
+    """
+    Awards the badges whose thresholds lie between the old and new point
+    totals, in one INSERT. The row lock taken by award_points gives every
+    award a disjoint range; the unique constraint catches anything else.
+    """
+    thresholds = thresholds_crossed(old_points, user.points)
+    if not thresholds:
+        return []
+    rows = [
+        {
+            "user_id": user.id,
+            "badge_name": badge_for(threshold)["name"],
+            "badge_description": badge_for(threshold)["description"],
+            "points_required": threshold,
+        }
+        for threshold in thresholds
+    ]
+    earned = (
+        await db.scalars(
+            insert(Badge)
+            .values(rows)
+            .on_conflict_do_nothing(constraint="uix_badge_user_points")
+            .returning(Badge.points_required)
+        )
+    ).all()
+    return [badge_for(threshold) for threshold in sorted(earned)]
+
+
+def rebuild_points(db: Session, user_ids=None):
+    """
+    Recomputes users.points from the ledger, for `user_ids` or everyone.
+    Returns the ids of users whose stored total was wrong.
+    """
+    ledger_total = (
+        select(func.coalesce(func.sum(PointsLedger.delta), 0))
+        .where(PointsLedger.user_id == User.id)
+        .scalar_subquery()
+    )
+    query = (
+        update(User)
+        .values(points=ledger_total)
+        .where(User.points.is_distinct_from(ledger_total))
+        .returning(User.id)
+    )
+    if user_ids is not None:
+        query = query.where(User.id.in_(user_ids))
+    return db.scalars(query).all()
@@ -0,0 +1,137 @@
+import heapq
+import os
+from datetime import datetime, timedelta
+
+from sqlalchemy import String, cast, func, literal, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.events import REMINDER_CHANNEL
+from app.models import Notification, Reminder, utcnow
+
+# A reminder is "due soon" (and notified) this long before its due date
+REMINDER_DUE_SOON_HOURS = float(os.getenv("REMINDER_DUE_SOON_HOURS", "72"))
+
+# How far past the due-soon horizon each window read loads reminders, so the
+# due_date range is read once per this many seconds rather than every tick
+REMINDER_LOOKAHEAD_SECONDS = float(os.getenv("REMINDER_LOOKAHEAD_SECONDS", "3600"))
+
+# The heap is rebuilt from the database at least this often, which also
+# picks up reminders whose ids committed out of order
+REMINDER_RELOAD_SECONDS = float(os.getenv("REMINDER_RELOAD_SECONDS", "3600"))
+
+REMINDER_DUE = "reminder_due"
+
+
+class ReminderScheduler:
+    """
+    Reminders ordered by when their due-soon notification fires, in a heap
+    holding only the due dates up to a moving window end. A tick reads the
+    due_date index only when the window needs extending, plus a primary key
+    range for reminders added since the last tick; neither grows with the
+    size of the table. `clock` returns naive UTC datetimes and can be
+    replaced in tests.
+    """
+
+    def __init__(
+        self,
+        clock=utcnow,
+        due_soon=timedelta(hours=REMINDER_DUE_SOON_HOURS),
+        lookahead=timedelta(seconds=REMINDER_LOOKAHEAD_SECONDS),
+        reload_every=timedelta(seconds=REMINDER_RELOAD_SECONDS),
+    ):
+        self.clock = clock
+        self.due_soon = due_soon
+        self.lookahead = lookahead
+        self.reload_every = reload_every
+        self.heap = []  # (notify_at, reminder_id)
+        self.scheduled = set()
+        self.loaded_at = None
+        self.loaded_until = None  # every reminder due before this is scheduled
+        self.last_id = 0  # highest reminder id already considered
+
+    def _push(self, reminder_id: int, due_date: datetime):
+        if reminder_id not in self.scheduled:
+            self.scheduled.add(reminder_id)
+            heapq.heappush(self.heap, (due_date - self.due_soon, reminder_id))
+
+    def refresh(self, db: Session, now: datetime):
+        """Brings the heap up to date with the reminders table."""
+        if self.loaded_at is None or now - self.loaded_at >= self.reload_every:
+            self.heap, self.scheduled = [], set()
+            self.last_id = db.scalar(select(func.max(Reminder.id))) or 0
+            self.loaded_at = self.loaded_until = now
+
+        # Reminders added since the last tick: a short range on the primary key
+        added = db.execute(
+            select(Reminder.id, Reminder.due_date)
+            .where(Reminder.id > self.last_id)
+            .order_by(Reminder.id)
+        ).all()
+        for reminder_id, due_date in added:
+            if due_date < self.loaded_until:
+                self._push(reminder_id, due_date)
+        if added:
+            self.last_id = added[-1].id
+
+        # Slide the window once the heap is about to run out of known reminders
+        if self.loaded_until <= now + self.due_soon:
+            window_end = now + self.due_soon + self.lookahead
+            for reminder_id, due_date in db.execute(
+                select(Reminder.id, Reminder.due_date).where(
+                    Reminder.due_date >= self.loaded_until,
+                    Reminder.due_date < window_end,
+                )
+            ):
+                self._push(reminder_id, due_date)
+            self.loaded_until = window_end
+
+    def pop_due(self, now: datetime):
+        """Ids of the reminders whose notification time has come."""
+        due = []
+        while self.heap and self.heap[0][0] <= now:
+            _, reminder_id = heapq.heappop(self.heap)
+            self.scheduled.discard(reminder_id)
+            due.append(reminder_id)
+        return due
+
+    def tick(self, db: Session) -> int:
+        """
+        Refreshes, then writes a notification for every reminder now due
+        soon. Reminders deleted in the meantime are skipped, and the unique
+        constraint makes a repeat after a reload a no-op. Each user notified
+        is signalled on REMINDER_CHANNEL, delivered once the caller commits.
+        Returns the number of notifications written.
+        """
+        now = self.clock()
+        self.refresh(db, now)
+        due = self.pop_due(now)
+        if not due:
+            return 0
+        written = (
+            insert(Notification)
+            .from_select(
+                ["user_id", "kind", "reminder_id", "created_at"],
+                select(
+                    Reminder.user_id,
+                    literal(REMINDER_DUE),
+                    Reminder.id,
+                    func.timezone("utc", func.now()),
+                ).where(
+                    Reminder.id.in_(due),
+                    Reminder.due_date <= now + self.due_soon,
+                ),
+            )
+            .on_conflict_do_nothing(constraint="uix_notification_user_reminder")
+            .returning(Notification.user_id)
+            .cte("written")
+        )
+        # One row per notification written; Postgres folds the repeated
+        # NOTIFYs for a user into one
+        rows = db.execute(
+            select(
+                written.c.user_id,
+                func.pg_notify(REMINDER_CHANNEL, cast(written.c.user_id, String)),
+            )
+        ).all()
+        return len(rows)
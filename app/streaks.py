@@ -0,0 +1,50 @@
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import Integer, cast, func, select
+
+from app.models import CheckIn
+
+
+def checkin_today_utc() -> date:
+    """The day a check-in made now counts for."""
+    return datetime.now(timezone.utc).date()
+
+
+def streaks_query(user_id: int, today: date):
+    """
+    Current and longest check-in streaks in days, as one gaps-and-islands
+    query: consecutive days minus their row number give the same date, so
+    each run of days is one group. The current streak is the run that ends
+    today or yesterday (today's check-in may still be to come). Reads only
+    the (user_id, checkin_day) unique index.
+    """
+    days = (
+        select(
+            CheckIn.checkin_day.label("day"),
+            (
+                CheckIn.checkin_day
+                - cast(func.row_number().over(order_by=CheckIn.checkin_day), Integer)
+            ).label("run"),
+        )
+        .where(CheckIn.user_id == user_id)
+        .subquery()
+    )
+    runs = (
+        select(func.max(days.c.day).label("last_day"), func.count().label("length"))
+        .group_by(days.c.run)
+        .subquery()
+    )
+    return select(
+        func.coalesce(
+            func.max(runs.c.length).filter(
+                runs.c.last_day >= today - timedelta(days=1)
+            ),
+            0,
+        ).label("current"),
+        func.coalesce(func.max(runs.c.length), 0).label("longest"),
+    )
+
+
+async def get_streaks(db, user_id: int) -> dict:
+    row = (await db.execute(streaks_query(user_id, checkin_today_utc()))).one()
+    return {"current": row.current, "longest": row.longest}
@@ -0,0 +1,100 @@
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+# Concurrency benchmark for /dashboard against a running server.
+# Start the app once with DB_MODE=sync and once with DB_MODE=async, with the
+# page cache off so every request reaches the database, e.g.
+#   DB_MODE=async PAGE_CACHE_ENABLED=false uvicorn app.main:app --port 8000
+#   python scripts/bench_dashboard.py --url http://localhost:8000 --concurrency 50
+
+USERNAME = "bench_user"
+EMAIL = "bench_user@example.com"
+PASSWORD = "BenchP@ss123"
+
+
+async def login(client):
+    await client.post(
+        "/register",
+        data={"username": USERNAME, "email": EMAIL, "password": PASSWORD},
+    )
+    response = await client.post(
+        "/login", data={"username": USERNAME, "password": PASSWORD}
+    )
+    if response.status_code != 302:
+        raise SystemExit(f"Login failed: HTTP {response.status_code}")
+
+
+async def worker(client, path, deadline, latencies, errors, cache_hits):
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            response = await client.get(path)
+            if response.status_code != 200:
+                errors.append(response.status_code)
+                continue
+            if response.headers.get("x-page-cache") == "hit":
+                cache_hits.append(1)
+        except httpx.HTTPError as e:
+            errors.append(type(e).__name__)
+            continue
+        latencies.append(time.perf_counter() - started)
+
+
+async def run(args):
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=args.url, limits=limits, timeout=30
+    ) as client:
+        await login(client)
+        # Warm up connection pools and caches
+        await client.get(args.path)
+
+        latencies, errors, cache_hits = [], [], []
+        deadline = time.perf_counter() + args.duration
+        await asyncio.gather(
+            *[
+                worker(client, args.path, deadline, latencies, errors, cache_hits)
+                for _ in range(args.concurrency)
+            ]
+        )
+
+    if not latencies:
+        raise SystemExit(f"No successful requests ({len(errors)} errors)")
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{args.path} x{args.concurrency} for {args.duration}s")
+    print(f"  requests:   {len(latencies)} ok, {len(errors)} failed")
+    print(f"  throughput: {len(latencies) / args.duration:.1f} req/s")
+    print(
+        f"  latency:    p50 {statistics.median(latencies) * 1000:.1f} ms, "
+        f"p95 {p95 * 1000:.1f} ms, max {latencies[-1] * 1000:.1f} ms"
+    )
+    if cache_hits:
+        print(f"  page cache: {len(cache_hits)} hits")
+        if not args.allow_cache:
+            raise SystemExit(
+                "Responses came from the page cache, not the database; restart "
+                "the server with PAGE_CACHE_ENABLED=false or pass --allow-cache"
+            )
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Parallel /dashboard load test")
+    parser.add_argument("--url", default="http://localhost:8001")
+    parser.add_argument("--path", default="/dashboard")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument(
+        "--allow-cache",
+        action="store_true",
+        help="measure page cache hits instead of failing on them",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(run(parse_args()))
@@ -1,48 +1,526 @@
+import argparse
+import asyncio
+import codecs
+import functools
+import hashlib
+import json
+import os
+import random
 import requests
+import threading
 import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.utils import formatdate
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+from sqlalchemy import func, literal_column, select
+from sqlalchemy.dialects.postgresql import insert
+
 from app.db import SessionLocal
-from app.models import Internship
+from app.events import INGEST_CHANNEL
+from app.history import (
+    history_events,
+    maintain_history_partitions,
+    mark_seen,
+    record_history,
+)
+from app.matching import (
+    normalize_company,
+    refresh_companies,
+    refresh_matches_for_internships,
+)
+from app.models import Internship, FeedState, utcnow
 
 URL = "https://raw.githubusercontent.com/vanshb03/Summer2026-Internships/dev/.github/scripts/listings.json"
 
+# Listings source: an http(s) URL, a file:// URL or a plain path to a local file
+SOURCE_URL = os.getenv("LISTINGS_URL", URL)
+
+# Per-source schedule defaults, in seconds: time between successful fetches,
+# random delay added to each wait so sources and replicas don't fire together,
+# limit on one whole fetch, and the first and longest retry delays on failure
+INGEST_INTERVAL = float(os.getenv("INGEST_INTERVAL_SECONDS", "3600"))
+INGEST_JITTER = float(os.getenv("INGEST_JITTER_SECONDS", "60"))
+INGEST_TIMEOUT = float(os.getenv("INGEST_TIMEOUT_SECONDS", "300"))
+INGEST_RETRY = float(os.getenv("INGEST_RETRY_SECONDS", "30"))
+INGEST_MAX_BACKOFF = float(os.getenv("INGEST_MAX_BACKOFF_SECONDS", "3600"))
+
+# Number of listings written per INSERT ... ON CONFLICT statement
+BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "500"))
+
+# Bytes read from the feed at a time while streaming it
+CHUNK_SIZE = 64 * 1024
+
+# Columns refreshed from the feed when a listing already exists
+UPSERT_COLUMNS = (
+    "company",
+    "role",
+    "location",
+    "link",
+    "date_posted",
+    "source",
+    "active",
+    "is_visible",
+    "season",
+)
+
+
+def iter_json_array(chunks):
+    """
+    Yields the elements of a top-level JSON array one at a time from an
+    iterable of text chunks, so only one element (plus the current chunk)
+    is held in memory at a time.
+    """
+    decoder = json.JSONDecoder()
+    chunks = iter(chunks)
+    buffer, pos = "", 0
+    expecting = "["  # "[", then "value" / "value or ]", then ", or ]"
+
+    while True:
+        while pos < len(buffer) and buffer[pos] in " \t\r\n":
+            pos += 1
+        if pos == len(buffer):
+            chunk = next(chunks, None)
+            if chunk is None:
+                raise ValueError("Listings feed ended before the closing ]")
+            buffer, pos = chunk, 0
+            continue
+
+        char = buffer[pos]
+        if expecting == "[":
+            if char != "[":
+                raise ValueError("Listings feed is not a JSON array")
+            pos += 1
+            expecting = "value or ]"
+        elif expecting == ", or ]":
+            if char == "]":
+                return
+            if char != ",":
+                raise ValueError(f"Unexpected {char!r} in listings feed")
+            pos += 1
+            expecting = "value"
+        elif char == "]" and expecting == "value or ]":
+            return
+        else:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+                # A number or literal at the very end of the buffer may be cut short
+                complete = end < len(buffer) or isinstance(value, (dict, list, str))
+            except json.JSONDecodeError:
+                complete = False
+            if not complete:
+                # The element continues in the next chunk
+                chunk = next(chunks, None)
+                if chunk is None:
+                    raise ValueError("Listings feed is malformed or truncated")
+                buffer, pos = buffer[pos:] + chunk, 0
+                continue
+            yield value
+            pos = end
+            expecting = ", or ]"
+
+
+def until(chunks, deadline):
+    """Passes chunks through, raising TimeoutError once `deadline` (monotonic) passes."""
+    for chunk in chunks:
+        if deadline is not None and time.monotonic() > deadline:
+            raise TimeoutError("Listings feed took too long to read")
+        yield chunk
+
+
+def decode_chunks(byte_chunks, encoding):
+    decoder = codecs.getincrementaldecoder(encoding)()
+    for chunk in byte_chunks:
+        yield decoder.decode(chunk)
+    yield decoder.decode(b"", final=True)
+
+
+@contextmanager
+def open_feed(source=SOURCE_URL, etag=None, last_modified=None, timeout=None):
+    """
+    Opens the listings feed, sending the validators from the previous run.
+    Yields (listings, etag, last_modified) where `listings` lazily parses the
+    feed one entry at a time, or is None when the source reports it has not
+    changed since then. Reading raises TimeoutError once `timeout` seconds
+    have passed since opening.
+    """
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    if urlparse(source).scheme in ("http", "https"):
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        with requests.get(
+            source, headers=headers, stream=True, timeout=timeout
+        ) as response:
+            if response.status_code == 304:
+                yield None, etag, last_modified
+                return
+            response.raise_for_status()
+            chunks = decode_chunks(
+                until(response.iter_content(CHUNK_SIZE), deadline),
+                response.encoding or "utf-8",
+            )
+            yield (
+                iter_json_array(chunks),
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified"),
+            )
+        return
+
+    # Local file: its modification time plays the role of Last-Modified
+    path = source
+    if source.startswith("file:"):
+        path = url2pathname(urlparse(source).path)
+    mtime = formatdate(os.path.getmtime(path), usegmt=True)
+    if mtime == last_modified:
+        yield None, etag, last_modified
+        return
+    with open(path, encoding="utf-8") as f:
+        chunks = until(iter(lambda: f.read(CHUNK_SIZE), ""), deadline)
+        yield iter_json_array(chunks), None, mtime
+
 
-def fetch_json():
-    response = requests.get(URL)
-    response.raise_for_status()
-    return response.json()
+def content_hash(row):
+    """Stable digest of the feed fields of a row, used to skip no-op writes."""
+    payload = json.dumps(
+        [row[name] for name in UPSERT_COLUMNS], separators=(",", ":"), default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
 
-def update_internships(data):
+def parse_date_posted(value):
+    """Feed dates are epoch seconds; stored as naive UTC timestamps."""
+    try:
+        posted = datetime.fromtimestamp(float(value), timezone.utc)
+    except (TypeError, ValueError, OverflowError, OSError):
+        return None
+    return posted.replace(tzinfo=None)
+
+
+def to_row(item):
+    """Map one listings.json entry onto Internship column values."""
+    row = {
+        "id": item["id"],
+        "company": item["company_name"],
+        "role": item["title"],
+        "location": ", ".join(item.get("locations", [])),
+        "link": item.get("url"),
+        "date_posted": parse_date_posted(item.get("date_posted")),
+        "source": item.get("source"),
+        "active": item.get("active"),
+        "is_visible": item.get("is_visible"),
+        "season": item.get("season"),
+    }
+    row["content_hash"] = content_hash(row)
+    row["company_key"] = normalize_company(row["company"])
+    return row
+
+
+# Sources fetch and parse concurrently but write one batch at a time, so two
+# sources never deadlock on the companies rows they share
+WRITE_LOCK = threading.Lock()
+
+
+def update_internships(rows, source=None):
+    db = SessionLocal()
+    try:
+        now = utcnow()
+        with WRITE_LOCK:
+            maintain_history_partitions(db, now)
+        written, old_active = [], {}
+        for row in rows:
+            existing = db.get(Internship, row["id"])
+            if existing is not None:
+                old_active[row["id"]] = existing.active
+            row = dict(row, last_seen_at=now)
+            db.merge(Internship(**row))  # update if exists, insert if new
+            written.append(row)
+        with WRITE_LOCK:
+            db.flush()
+            ids = [row["id"] for row in written]
+            refresh_matches_for_internships(db, ids)
+            refresh_companies(db)
+            record_history(db, history_events(old_active, written, now, source))
+            db.commit()
+    finally:
+        db.close()
+
+
+def chunked(items, size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def upsert_batch(db, rows):
+    """
+    Writes one batch with a single INSERT ... ON CONFLICT (id) DO UPDATE.
+    Rows whose content hash is unchanged are left alone by the WHERE clause,
+    so they are not returned. Returns the (inserted, updated) ids.
+    """
+    stmt = insert(Internship).values(rows)
+    table = Internship.__table__
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.id],
+        set_={
+            name: stmt.excluded[name]
+            for name in UPSERT_COLUMNS
+            + ("content_hash", "company_key", "last_seen_at")
+        },
+        where=table.c.content_hash.is_distinct_from(stmt.excluded.content_hash),
+    ).returning(table.c.id, literal_column("(xmax = 0)").label("inserted"))
+
+    inserted, updated = [], []
+    for row in db.execute(stmt):
+        (inserted if row.inserted else updated).append(row.id)
+    return inserted, updated
+
+
+def bulk_update_internships(rows, batch_size=BATCH_SIZE, source=None):
+    """
+    Upserts normalized rows in chunks of `batch_size`, committing after each
+    chunk so no single transaction spans the whole feed. `rows` can be any
+    iterable, so a streamed feed is never held in memory all at once.
+    Postings that are new or changed active state go to internship_history,
+    diffed against the rows read back for each batch.
+    Returns counts of inserted, updated and unchanged rows.
+    """
+    stats = {"inserted": 0, "updated": 0, "unchanged": 0}
     db = SessionLocal()
     try:
-        for item in data:
-            internship = Internship(
-                id=item["id"],
-                company=item["company_name"],
-                role=item["title"],
-                location=", ".join(item.get("locations", [])),
-                link=item.get("url"),
-                date_posted=str(item.get("date_posted")),
-                source=item.get("source"),
-                active=item.get("active"),
-                is_visible=item.get("is_visible"),
-                season=item.get("season"),
+        now = utcnow()
+        with WRITE_LOCK:
+            maintain_history_partitions(db, now)
+        for batch in chunked(rows, batch_size):
+            # ON CONFLICT cannot touch the same row twice in one statement,
+            # so keep only the last occurrence of each id (same as merge).
+            # first_seen_at only sticks on insert; updates keep the old one
+            batch = list(
+                {
+                    row["id"]: dict(row, first_seen_at=now, last_seen_at=now)
+                    for row in batch
+                }.values()
             )
-            db.merge(internship)  # update if exists, insert if new
+            with WRITE_LOCK:
+                old = db.execute(
+                    select(
+                        Internship.id, Internship.company_key, Internship.active
+                    ).where(Internship.id.in_([row["id"] for row in batch]))
+                ).all()
+                old_keys = {row.id: row.company_key for row in old}
+                old_active = {row.id: row.active for row in old}
+                inserted, updated = upsert_batch(db, batch)
+                refresh_matches_for_internships(db, inserted + updated)
+                # A company moves between keys when its name changes
+                changed = set(inserted + updated)
+                refresh_companies(
+                    db,
+                    {row["company_key"] for row in batch if row["id"] in changed}
+                    | {old_keys[i] for i in updated if old_keys.get(i) is not None},
+                )
+                record_history(
+                    db,
+                    history_events(
+                        old_active,
+                        [row for row in batch if row["id"] in changed],
+                        now,
+                        source,
+                    ),
+                )
+                unchanged = [row["id"] for row in batch if row["id"] not in changed]
+                mark_seen(db, unchanged, now)
+                db.commit()
+            stats["inserted"] += len(inserted)
+            stats["updated"] += len(updated)
+            stats["unchanged"] += len(batch) - len(inserted) - len(updated)
+    finally:
+        db.close()
+    return stats
+
+
+def load_feed_state(source):
+    db = SessionLocal()
+    try:
+        state = db.get(FeedState, source)
+        if state is None:
+            return None, None
+        return state.etag, state.last_modified
+    finally:
+        db.close()
+
+
+def save_feed_state(source, etag, last_modified):
+    db = SessionLocal()
+    try:
+        db.merge(
+            FeedState(
+                source=source,
+                etag=etag,
+                last_modified=last_modified,
+                fetched_at=utcnow(),
+            )
+        )
         db.commit()
     finally:
         db.close()
 
 
-if __name__ == "__main__":
+def notify_ingest(stats):
+    """Wakes the web app's SSE listeners (see app/events.py)."""
+    db = SessionLocal()
+    try:
+        db.execute(select(func.pg_notify(INGEST_CHANNEL, json.dumps(stats))))
+        db.commit()
+    finally:
+        db.close()
 
-    while True:
 
+class Source:
+    """A listings feed, how to normalize its entries and how often to fetch it."""
+
+    def __init__(
+        self,
+        name,
+        location,
+        normalize=to_row,
+        interval=INGEST_INTERVAL,
+        jitter=INGEST_JITTER,
+        timeout=INGEST_TIMEOUT,
+        retry=INGEST_RETRY,
+        max_backoff=INGEST_MAX_BACKOFF,
+    ):
+        self.name = name
+        self.location = location  # URL, file:// URL or local path
+        self.normalize = normalize  # feed entry -> Internship column values
+        self.interval = interval
+        self.jitter = jitter
+        self.timeout = timeout
+        self.retry = retry
+        self.max_backoff = max_backoff
+
+    def next_delay(self, failures=0, rand=random.uniform):
+        """Seconds until the next fetch: the interval, or backoff after failures."""
+        if failures:
+            delay = min(self.retry * 2 ** (failures - 1), self.max_backoff)
+        else:
+            delay = self.interval
+        return delay + rand(0, self.jitter)
+
+
+# Feeds ingested by default, by name. Other feeds register here with a
+# `normalize` that maps their entries onto the same row shape as to_row
+# (ids must not collide with other sources')
+SOURCES = {}
+
+
+def register_source(name, location, **options):
+    SOURCES[name] = Source(name, location, **options)
+    return SOURCES[name]
+
+
+register_source("summer2026", SOURCE_URL)
+
+
+def ingest_source(source, mode="bulk", batch_size=BATCH_SIZE):
+    """Fetches one source and writes its listings, unless it is unchanged."""
+    etag, last_modified = load_feed_state(source.location)
+    with open_feed(source.location, etag, last_modified, source.timeout) as (
+        listings,
+        etag,
+        last_modified,
+    ):
+        if listings is None:
+            print(f"[{source.name}] Listings unchanged since last fetch, skipping.", flush=True)
+            return
+
+        started = time.perf_counter()
+        rows = map(source.normalize, listings)
+        if mode == "merge":
+            update_internships(rows, source.name)
+            print(f"[{source.name}] Internship data updated.", flush=True)
+            notify_ingest({"source": source.name})
+        else:
+            stats = bulk_update_internships(rows, batch_size, source.name)
+            print(
+                f"[{source.name}] Internship data updated: "
+                f"{stats['inserted']} inserted, {stats['updated']} updated, "
+                f"{stats['unchanged']} unchanged "
+                f"in {time.perf_counter() - started:.2f}s",
+                flush=True,
+            )
+            if stats["inserted"] or stats["updated"]:
+                notify_ingest(dict(stats, source=source.name))
+    # Only remember the validators once the data is safely written
+    save_feed_state(source.location, etag, last_modified)
+
+
+async def run_source(source, ingest, once=False):
+    """
+    Calls `ingest(source)` in a worker thread every `source.interval`,
+    retrying failures with exponential backoff. With `once`, returns after
+    the first attempt: True if it succeeded.
+    """
+    failures = 0
+    while True:
         try:
-            print("Fetching internships...", flush=True)
-            data = fetch_json()
-            update_internships(data)
-            print("Internship data updated.", flush=True)
+            print(f"[{source.name}] Fetching internships...", flush=True)
+            await asyncio.to_thread(ingest, source)
+            failures = 0
         except Exception as e:
-            print(f"Error: {e}", flush=True)
-        time.sleep(3600)  # Fetch internship data every hour
+            failures += 1
+            print(f"[{source.name}] Error: {e}", flush=True)
+        if once:
+            return failures == 0
+        await asyncio.sleep(source.next_delay(failures))
+
+
+async def run_sources(sources, ingest, once=False):
+    """Runs every source on its own schedule, all at the same time."""
+    return await asyncio.gather(
+        *(run_source(source, ingest, once) for source in sources)
+    )
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Fetch internship listings")
+    parser.add_argument(
+        "--mode",
+        choices=("bulk", "merge"),
+        default=os.getenv("INGEST_MODE", "bulk"),
+        help="bulk: batched INSERT ... ON CONFLICT, merge: one ORM merge per row",
+    )
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument(
+        "--source",
+        action="append",
+        dest="sources",
+        help="Listings URL, file:// URL or local path; repeatable. "
+        "Replaces the registered sources (default: $LISTINGS_URL)",
+    )
+    parser.add_argument(
+        "--once", action="store_true", help="Fetch every source once and exit"
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.sources:
+        sources = [Source(location, location) for location in args.sources]
+    else:
+        sources = list(SOURCES.values())
+    ingest = functools.partial(
+        ingest_source, mode=args.mode, batch_size=args.batch_size
+    )
+    results = asyncio.run(run_sources(sources, ingest, once=args.once))
+    if args.once and not all(results):
+        raise SystemExit(1)
@@ -0,0 +1,38 @@
+import argparse
+import os
+import sys
+
+from sqlalchemy import func, select
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.db import SessionLocal
+from app.events import POINTS_CHANNEL, USER_CHANNEL
+from app.points import rebuild_points
+
+# Recomputes users.points from the points ledger, e.g. after a manual fix
+#   python scripts/rebuild_points.py            (every user)
+#   python scripts/rebuild_points.py --user 42  (just one)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Rebuild point totals from the ledger")
+    parser.add_argument("--user", type=int, action="append", dest="user_ids")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    db = SessionLocal()
+    try:
+        changed = rebuild_points(db, args.user_ids)
+        # Running web workers drop their cached copies of these users
+        for user_id in changed:
+            db.execute(select(func.pg_notify(USER_CHANNEL, str(user_id))))
+        if changed:
+            # and rebuild their leaderboard rankings
+            db.execute(select(func.pg_notify(POINTS_CHANNEL, "rebuild")))
+        db.commit()
+    finally:
+        db.close()
+    print(f"Rebuilt points: {len(changed)} user(s) corrected", flush=True)
@@ -0,0 +1,41 @@
+import argparse
+import os
+import time
+
+from app.db import SessionLocal
+from app.reminders import ReminderScheduler
+
+# Seconds between scheduler ticks
+TICK_SECONDS = float(os.getenv("REMINDER_TICK_SECONDS", "60"))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Write due-soon reminder notifications")
+    parser.add_argument("--tick", type=float, default=TICK_SECONDS)
+    parser.add_argument(
+        "--once", action="store_true", help="Run a single tick and exit"
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    scheduler = ReminderScheduler()
+
+    while True:
+        db = SessionLocal()
+        try:
+            written = scheduler.tick(db)
+            db.commit()
+            if written:
+                print(f"Queued {written} reminder notification(s).", flush=True)
+        except Exception as e:
+            db.rollback()
+            # Start over from the database rather than trust a half-applied tick
+            scheduler.loaded_at = None
+            print(f"Error: {e}", flush=True)
+        finally:
+            db.close()
+        if args.once:
+            break
+        time.sleep(args.tick)
@@ -0,0 +1,83 @@
+from fastapi import HTTPException
+import asyncio
+import os
+import sys
+
+import bcrypt
+import pytest
+
+sys.path.insert(1, os.getcwd())
+from app import auth
+from app.cache import TTLCache
+
+
+# _____________Testing Password Hashing_____________
+
+
+def test_hash_and_verify_off_loop():
+    hashed = asyncio.run(auth.hash_password_async("StrongP@ss123"))
+    assert asyncio.run(auth.verify_password_async("StrongP@ss123", hashed))
+    assert not asyncio.run(auth.verify_password_async("WrongP@ss123", hashed))
+
+
+# Hashes made with a lower cost than BCRYPT_ROUNDS get upgraded at login
+def test_needs_rehash_after_cost_increase():
+    old_hash = bcrypt.hashpw(b"StrongP@ss123", bcrypt.gensalt(rounds=4)).decode()
+    assert auth.needs_rehash(old_hash) == (auth.BCRYPT_ROUNDS > 4)
+    assert not auth.needs_rehash(auth.hash_password("StrongP@ss123"))
+
+
+# Once the pool and its queue are full, new calls are refused with a 503
+def test_hash_queue_limit(monkeypatch):
+    monkeypatch.setattr(
+        auth, "_hash_in_flight", auth.HASH_WORKERS + auth.HASH_QUEUE_LIMIT
+    )
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(auth.verify_password_async("x", "y"))
+    assert exc.value.status_code == 503
+
+
+# _____________Testing Session Tokens_____________
+
+
+def test_session_token_round_trip():
+    token = auth.create_session_token(42)
+    assert auth.read_session_token(token) == 42
+
+
+def test_session_token_rejects_tampering():
+    token = auth.create_session_token(42)
+    _, expires_at, signature = token.split(".")
+    assert auth.read_session_token(f"43.{expires_at}.{signature}") is None
+    assert auth.read_session_token("42") is None
+
+
+# A non-ASCII cookie is just an invalid token, not a server error
+def test_session_token_rejects_non_ascii():
+    token = auth.create_session_token(42)
+    user_id, expires_at, _ = token.split(".")
+    assert auth.read_session_token(f"{user_id}.{expires_at}.sïgnature") is None
+    assert auth.read_session_token("４２.１.é") is None
+
+
+def test_session_token_expires(monkeypatch):
+    token = auth.create_session_token(42)
+    monkeypatch.setattr(auth.time, "time", lambda: 2**40)
+    assert auth.read_session_token(token) is None
+
+
+# _____________Testing User Cache_____________
+
+
+def test_user_cache_ttl_and_lru():
+    now = [0.0]
+    cache = TTLCache(maxsize=2, ttl=10, clock=lambda: now[0])
+    cache.set(1, "a")
+    cache.set(2, "b")
+    cache.get(1)
+    cache.set(3, "c")  # evicts 2, the least recently used
+    assert cache.get(2) is None
+    assert cache.get(1) == "a"
+    now[0] = 11
+    assert cache.get(1) is None
+    assert len(cache) == 1
@@ -0,0 +1,27 @@
+import os
+import sys
+
+sys.path.insert(1, os.getcwd())
+from app.badges import badge_for, next_badge, thresholds_crossed
+
+
+# _____________Testing Badge Engine_____________
+
+
+def test_thresholds_crossed_only_covers_the_gain():
+    assert list(thresholds_crossed(0, 9)) == []
+    assert list(thresholds_crossed(8, 10)) == [10]
+    assert list(thresholds_crossed(10, 19)) == []
+    assert list(thresholds_crossed(4995, 5005)) == [5000]
+    assert list(thresholds_crossed(95, 112)) == [100, 110]
+
+
+def test_catalog_names():
+    assert badge_for(10)["name"] == "Getting Started"
+    assert badge_for(100)["name"] == "Ultimate"
+    # Superstar k is earned at 90 + 10k points
+    assert badge_for(110)["name"] == "Superstar 2"
+    assert badge_for(5000)["name"] == "Superstar 491"
+    assert badge_for(5000)["description"] == "Reached 5000 points"
+    assert next_badge(0)["points"] == 10
+    assert next_badge(40)["points"] == 50
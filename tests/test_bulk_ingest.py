@@ -0,0 +1,54 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(1, os.getcwd())
+from app.models import Internship
+from conftest import TestingSessionLocal
+from scripts import fetch_internships
+from scripts.fetch_internships import bulk_update_internships, to_row
+
+
+# _____________Testing Batched Ingest_____________
+
+LISTINGS = [
+    {
+        "id": f"bulk-{i}",
+        "company_name": f"Company {i}",
+        "title": "Software Engineer Intern",
+        "locations": ["Remote"],
+        "date_posted": 1751328000 + i,
+        "active": True,
+    }
+    for i in range(10)
+]
+
+
+@pytest.fixture
+def ingest(monkeypatch):
+    monkeypatch.setattr(fetch_internships, "SessionLocal", TestingSessionLocal)
+    return lambda listings: bulk_update_internships(map(to_row, listings), batch_size=4)
+
+
+# Counts come from RETURNING (xmax = 0) and the content-hash WHERE clause
+def test_ingest_counts_inserts_updates_and_unchanged(ingest):
+    assert ingest(LISTINGS) == {"inserted": 10, "updated": 0, "unchanged": 0}
+    assert ingest(LISTINGS) == {"inserted": 0, "updated": 0, "unchanged": 10}
+
+    changed = [dict(item) for item in LISTINGS]
+    changed[3]["title"] = "Data Science Intern"
+    assert ingest(changed) == {"inserted": 0, "updated": 1, "unchanged": 9}
+
+    db = TestingSessionLocal()
+    assert db.get(Internship, "bulk-3").role == "Data Science Intern"
+    db.close()
+
+
+# A listing repeated in one batch is written once, last occurrence wins
+def test_ingest_dedupes_ids_within_a_batch(ingest):
+    repeated = [LISTINGS[0], dict(LISTINGS[0], title="Renamed")]
+    assert ingest(repeated) == {"inserted": 1, "updated": 0, "unchanged": 0}
+    db = TestingSessionLocal()
+    assert db.get(Internship, "bulk-0").role == "Renamed"
+    db.close()
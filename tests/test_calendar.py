@@ -0,0 +1,43 @@
+from datetime import timedelta
+import os
+import sys
+
+sys.path.insert(1, os.getcwd())
+from app.streaks import checkin_today_utc
+
+
+# _____________Testing Calendar Events_____________
+
+
+def test_calendar_returns_checkins_in_range(client):
+    client.post("/api/checkin")
+    today = checkin_today_utc()
+    params = {
+        "start": f"{today - timedelta(days=15)}T00:00:00",
+        "end": f"{today + timedelta(days=15)}T00:00:00",
+    }
+    response = client.get("/api/calendar/events", params=params)
+    assert response.status_code == 200
+    assert [e["type"] for e in response.json()] == ["checkin"]
+    assert response.headers["etag"]
+
+
+# An unchanged range revalidates with 304 and no body
+def test_calendar_etag_not_modified(client):
+    params = {"start": "2020-01-01T00:00:00", "end": "2020-02-01T00:00:00"}
+    first = client.get("/api/calendar/events", params=params)
+    assert first.json() == []
+    second = client.get(
+        "/api/calendar/events",
+        params=params,
+        headers={"If-None-Match": first.headers["etag"]},
+    )
+    assert second.status_code == 304
+    assert second.content == b""
+
+
+def test_calendar_rejects_bad_range(client):
+    params = {"start": "2020-02-01T00:00:00", "end": "2020-01-01T00:00:00"}
+    assert client.get("/api/calendar/events", params=params).status_code == 400
+    params = {"start": "2020-01-01T00:00:00", "end": "2022-01-01T00:00:00"}
+    assert client.get("/api/calendar/events", params=params).status_code == 400
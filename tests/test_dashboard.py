@@ -0,0 +1,26 @@
+import os
+import sys
+from datetime import datetime
+
+sys.path.insert(1, os.getcwd())
+from app.dashboard import _parse_datetimes
+
+
+# _____________Testing Dashboard JSON Timestamps_____________
+
+
+# json_agg trims trailing zeros off the fraction, or drops it entirely
+def test_parse_datetimes_with_trimmed_fractions():
+    rows = [
+        {"due_date": "2024-05-01T12:00:05.12"},
+        {"due_date": "2024-05-01T12:00:05.123456"},
+        {"due_date": "2024-05-01T12:00:05"},
+        {"due_date": None},
+    ]
+    _parse_datetimes(rows, "due_date")
+    assert [row["due_date"] for row in rows] == [
+        datetime(2024, 5, 1, 12, 0, 5, 120000),
+        datetime(2024, 5, 1, 12, 0, 5, 123456),
+        datetime(2024, 5, 1, 12, 0, 5),
+        None,
+    ]
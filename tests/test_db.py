@@ -0,0 +1,86 @@
+import os
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool, QueuePool
+
+sys.path.insert(1, os.getcwd())
+from app import db
+from app.main import app
+from conftest import TEST_DATABASE_URL, TEST_PASSWORD, TEST_USERNAME
+
+
+# _____________Testing Pool Telemetry_____________
+
+
+def test_pool_checkouts_and_timeouts_are_counted():
+    engine = create_engine(
+        "sqlite://",
+        poolclass=db.timed_pool(QueuePool, "test"),
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    metrics = engine.pool.metrics
+    held = engine.connect()
+    held.execute(text("select 1"))
+    with pytest.raises(PoolTimeoutError):
+        engine.connect()
+    assert metrics.checkouts == 1
+    assert metrics.timeouts == 1
+    assert metrics.usage()["checked_out"] == 1
+
+    held.close()
+    output = db.render_pool_metrics()
+    assert 'db_pool_checkout_wait_seconds_count{engine="test"} 1' in output
+    assert 'db_pool_checkout_timeouts_total{engine="test"} 1' in output
+    db.pool_metrics.remove(metrics)
+
+
+# _____________Testing DB_MODE=async_____________
+
+
+@pytest.fixture
+def async_client(monkeypatch):
+    """A TestClient whose requests run on asyncpg AsyncSessions."""
+    # Each TestClient request runs on a fresh event loop, so don't keep
+    # asyncpg connections around between them
+    async_engine = create_async_engine(
+        db.with_driver(TEST_DATABASE_URL, "asyncpg"), poolclass=NullPool
+    )
+    AsyncTestingSessionLocal = async_sessionmaker(
+        async_engine, expire_on_commit=False
+    )
+
+    async def override_get_db():
+        async with AsyncTestingSessionLocal() as session:
+            yield session
+
+    monkeypatch.setitem(app.dependency_overrides, db.get_db, override_get_db)
+    return TestClient(app)
+
+
+# asyncpg refuses timezone-aware datetimes for TIMESTAMP WITHOUT TIME ZONE
+# columns, where psycopg2 silently dropped the offset
+def test_register_and_checkin_on_asyncpg(async_client):
+    response = async_client.post(
+        "/register",
+        data={
+            "username": TEST_USERNAME,
+            "email": f"{TEST_USERNAME}@example.com",
+            "password": TEST_PASSWORD,
+        },
+        follow_redirects=False,
+    )
+    assert response.status_code == 303
+    async_client.post(
+        "/login", data={"username": TEST_USERNAME, "password": TEST_PASSWORD}
+    )
+
+    response = async_client.post("/api/checkin")
+    assert response.status_code == 200
+    assert response.json()["points"] == 2
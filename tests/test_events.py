@@ -0,0 +1,104 @@
+import asyncio
+import os
+import sys
+
+sys.path.insert(1, os.getcwd())
+from app import api
+from app.events import (
+    INGEST_CHANNEL,
+    INGEST_EVENT,
+    REMINDER_CHANNEL,
+    REMINDER_EVENT,
+    NotificationBroker,
+)
+
+
+# _____________Testing Notification Broker_____________
+
+
+# Every subscriber gets its own copy of each streamed notification
+def test_publish_fans_out_to_subscribers():
+    broker = NotificationBroker()
+    first, second = broker.subscribe(), broker.subscribe()
+    broker._dispatch(INGEST_CHANNEL, '{"new": 3}')
+    assert first.get_nowait() == (INGEST_EVENT, '{"new": 3}')
+    assert second.get_nowait() == (INGEST_EVENT, '{"new": 3}')
+
+    broker.unsubscribe(first)
+    broker._dispatch(REMINDER_CHANNEL, "7")
+    assert first.empty()
+    assert second.get_nowait() == (REMINDER_EVENT, "7")
+
+
+# Callbacks only see their own channel, including the None sent on reconnect,
+# which isn't forwarded to SSE clients
+def test_on_dispatches_per_channel():
+    broker = NotificationBroker()
+    calls = []
+    broker.on("points_changed", lambda payload: calls.append(("points", payload)))
+    broker.on(INGEST_CHANNEL, lambda payload: calls.append(("ingest", payload)))
+    queue = broker.subscribe()
+
+    broker._dispatch("points_changed", "10 20")
+    broker._dispatch(INGEST_CHANNEL, None)
+    assert calls == [("points", "10 20"), ("ingest", None)]
+    assert queue.empty()
+
+
+# A failing callback doesn't stop the others or the fan-out
+def test_failing_callback_is_contained():
+    broker = NotificationBroker()
+    calls = []
+    broker.on(INGEST_CHANNEL, lambda payload: 1 / 0)
+    broker.on(INGEST_CHANNEL, calls.append)
+    queue = broker.subscribe()
+    broker._dispatch(INGEST_CHANNEL, "x")
+    assert calls == ["x"]
+    assert queue.get_nowait() == (INGEST_EVENT, "x")
+
+
+# A slow client's full queue drops new events instead of blocking the rest
+def test_full_queue_drops_events():
+    broker = NotificationBroker()
+    slow, fast = broker.subscribe(), broker.subscribe()
+    for n in range(slow.maxsize):
+        broker.publish(INGEST_EVENT, str(n))
+        fast.get_nowait()
+    broker.publish(INGEST_EVENT, "dropped")
+    assert slow.qsize() == slow.maxsize
+    assert fast.get_nowait() == (INGEST_EVENT, "dropped")
+
+
+# _____________Testing Notification Stream_____________
+
+
+class FakeSession:
+    async def close(self):
+        pass
+
+
+class FakeUser:
+    id = 7
+
+
+def test_stream_forwards_events_and_unsubscribes_on_close(monkeypatch):
+    broker = NotificationBroker()
+    monkeypatch.setattr(api, "broker", broker)
+
+    async def run():
+        response = await api.notification_stream(None, FakeSession(), FakeUser())
+        body = response.body_iterator
+        assert await body.__anext__() == "retry: 10000\n\n"
+        assert len(broker._subscribers) == 1
+
+        broker._dispatch(REMINDER_CHANNEL, "8")  # another user's reminders
+        broker._dispatch(REMINDER_CHANNEL, "7")
+        assert await body.__anext__() == "event: reminder\ndata: 7\n\n"
+        broker._dispatch(INGEST_CHANNEL, '{"new": 1}')
+        assert await body.__anext__() == 'event: ingest\ndata: {"new": 1}\n\n'
+
+        # The client went away
+        await body.aclose()
+        assert not broker._subscribers
+
+    asyncio.run(run())
@@ -0,0 +1,104 @@
+from datetime import datetime, timedelta
+import os
+import sys
+
+sys.path.insert(1, os.getcwd())
+from app.dashboard import RECENT_LIMIT
+from app.models import ApplicationLog, Reminder, User, WatchlistItem
+from conftest import TEST_USERNAME, TestingSessionLocal
+
+
+# _____________Testing Dashboard History_____________
+
+
+def add_applications(count):
+    db = TestingSessionLocal()
+    user = db.query(User).filter(User.username == TEST_USERNAME).first()
+    for i in range(count):
+        db.add(
+            ApplicationLog(
+                user_id=user.id,
+                company=f"Company {i}",
+                role="Intern",
+                status="applied",
+                date_applied=datetime(2024, 1, 1) + timedelta(days=i),
+            )
+        )
+    db.commit()
+    db.close()
+
+
+# Walking next_cursor returns every application once, newest first
+def test_application_history_pagination(client):
+    add_applications(25)
+    seen = []
+    params = {"limit": 10}
+    while True:
+        page = client.get("/api/applications", params=params).json()
+        seen.extend(r["company"] for r in page["results"])
+        if not page["next_cursor"]:
+            break
+        params["cursor"] = page["next_cursor"]
+    assert seen == [f"Company {i}" for i in reversed(range(25))]
+
+
+def test_history_invalid_cursor(client):
+    response = client.get("/api/checkins", params={"cursor": "nope"})
+    assert response.status_code == 400
+
+
+def add_reminders(count):
+    db = TestingSessionLocal()
+    user = db.query(User).filter(User.username == TEST_USERNAME).first()
+    for i in range(count):
+        db.add(
+            Reminder(
+                user_id=user.id,
+                company=f"Company {i}",
+                role="Intern",
+                text="Deadline",
+                # Pairs share a due date, so the id breaks ties
+                due_date=datetime(2030, 1, 1) + timedelta(days=i // 2),
+            )
+        )
+    db.commit()
+    db.close()
+
+
+# Reminders page soonest due first, past the dashboard's first page
+def test_reminder_pagination(client):
+    add_reminders(25)
+    seen = []
+    params = {"limit": 10}
+    while True:
+        page = client.get("/api/reminders", params=params).json()
+        seen.extend(r["company"] for r in page["results"])
+        if not page["next_cursor"]:
+            break
+        params["cursor"] = page["next_cursor"]
+    assert seen == [f"Company {i}" for i in range(25)]
+
+
+# Sections longer than RECENT_LIMIT get a "Load more" continuing after the
+# last row shown
+def test_dashboard_links_the_rest_of_a_section(client):
+    add_reminders(RECENT_LIMIT + 1)
+    db = TestingSessionLocal()
+    user = db.query(User).filter(User.username == TEST_USERNAME).first()
+    db.add(WatchlistItem(user_id=user.id, company_name="Acme", company_key="acme"))
+    db.commit()
+    db.close()
+
+    page = client.get("/dashboard").text
+    assert 'onclick="loadMoreReminders(this)"' in page
+    assert "loadMoreWatchlist(this)" not in page
+
+    cursor = page.split('data-cursor="')[1].split('"')[0]
+    rest = client.get("/api/reminders", params={"cursor": cursor}).json()
+    assert [r["company"] for r in rest["results"]] == [f"Company {RECENT_LIMIT}"]
+
+
+def test_reminders_page_redirects_to_dashboard(client):
+    response = client.get("/reminders", follow_redirects=False)
+    assert response.status_code == 303
+    assert response.headers["location"] == "/dashboard#reminders"
@@ -0,0 +1,103 @@
+import asyncio
+import json
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(1, os.getcwd())
+from scripts.fetch_internships import (
+    Source,
+    iter_json_array,
+    open_feed,
+    run_sources,
+    to_row,
+)
+
+
+# _____________Testing the streaming listings parser_____________
+
+LISTINGS = [
+    {
+        "id": str(i),
+        "company_name": f"Company {i}",
+        "title": "Software Engineer Intern",
+        "locations": ["New York, NY", "Remote"],
+        "date_posted": 1751328000 + i,
+        "active": i % 2 == 0,
+    }
+    for i in range(50)
+]
+
+
+def split(text, size):
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+# Entries are parsed the same no matter where the chunk boundaries fall
+@pytest.mark.parametrize("chunk_size", [1, 3, 17, 4096])
+def test_stream_matches_json_load(chunk_size):
+    text = json.dumps(LISTINGS, indent=2)
+    assert list(iter_json_array(split(text, chunk_size))) == LISTINGS
+
+
+def test_stream_empty_array():
+    assert list(iter_json_array([" [", " ] "])) == []
+
+
+# A feed cut off mid-entry must fail instead of silently dropping listings
+def test_stream_truncated_feed():
+    text = json.dumps(LISTINGS)[:-20]
+    with pytest.raises(ValueError):
+        list(iter_json_array(split(text, 100)))
+
+
+def test_stream_rejects_non_array():
+    with pytest.raises(ValueError):
+        list(iter_json_array(['{"id": "1"}']))
+
+
+# The content hash only changes when a feed field changes
+def test_content_hash_tracks_fields():
+    row = to_row(LISTINGS[0])
+    assert to_row(dict(LISTINGS[0]))["content_hash"] == row["content_hash"]
+    changed = dict(LISTINGS[0], active=not LISTINGS[0]["active"])
+    assert to_row(changed)["content_hash"] != row["content_hash"]
+
+
+# _____________Testing the ingest scheduler_____________
+
+
+def test_backoff_doubles_up_to_the_limit():
+    source = Source("feed", "feed.json", interval=3600, jitter=0, retry=10, max_backoff=50)
+    assert source.next_delay() == 3600
+    assert [source.next_delay(n) for n in (1, 2, 3, 4, 5)] == [10, 20, 40, 50, 50]
+    assert source.next_delay(rand=lambda low, high: high) == 3600
+
+
+# Sources are fetched at the same time, so two take as long as one
+def test_sources_run_concurrently():
+    def ingest(source):
+        if source.name == "broken":
+            raise ValueError("feed is down")
+        time.sleep(0.3)
+
+    sources = [Source("a", "a.json"), Source("b", "b.json"), Source("broken", "c.json")]
+    started = time.perf_counter()
+    results = asyncio.run(run_sources(sources, ingest, once=True))
+    assert results == [True, True, False]
+    assert time.perf_counter() - started < 0.55
+
+
+def test_local_feed_and_timeout(tmp_path):
+    path = tmp_path / "listings.json"
+    path.write_text(json.dumps(LISTINGS))
+    with open_feed(str(path), timeout=10) as (listings, etag, last_modified):
+        assert list(listings) == LISTINGS
+    # unchanged since the last fetch
+    with open_feed(f"file://{path}", None, last_modified) as (listings, _, _):
+        assert listings is None
+    with open_feed(str(path), timeout=-1) as (listings, _, _):
+        with pytest.raises(TimeoutError):
+            list(listings)
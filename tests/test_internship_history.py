@@ -0,0 +1,205 @@
+from datetime import datetime, timedelta, timezone
+import os
+import sys
+
+import pytest
+from sqlalchemy import select, text, update
+
+sys.path.insert(1, os.getcwd())
+from app import history
+from app.history import (
+    ACTIVATED,
+    DEACTIVATED,
+    FIRST_SEEN,
+    LAST_SEEN_RESOLUTION,
+    add_months,
+    history_events,
+    maintain_history_partitions,
+    month_start,
+    partition_name,
+)
+from app.models import Internship, InternshipHistory
+from conftest import TestingSessionLocal
+from scripts import fetch_internships
+from scripts.fetch_internships import bulk_update_internships, to_row
+
+
+# _____________Testing Internship Change History_____________
+
+AT = datetime(2025, 12, 15, 8, 30)
+
+
+# New postings and active flips are recorded; other updates are not
+def test_history_events_diff_against_old_rows():
+    old_active = {"open": True, "closing": True, "reopening": False, "renamed": True}
+    rows = [
+        {"id": "new", "active": True},
+        {"id": "open", "active": True},
+        {"id": "closing", "active": False},
+        {"id": "reopening", "active": True},
+        {"id": "renamed", "active": True},
+    ]
+    events = history_events(old_active, rows, AT, "summer2026")
+    assert [(e["internship_id"], e["event"]) for e in events] == [
+        ("new", FIRST_SEEN),
+        ("closing", DEACTIVATED),
+        ("reopening", ACTIVATED),
+    ]
+    assert all(e["occurred_at"] == AT and e["source"] == "summer2026" for e in events)
+
+
+def test_monthly_partitions():
+    month = month_start(AT)
+    assert month == datetime(2025, 12, 1)
+    assert add_months(month, 1) == datetime(2026, 1, 1)
+    assert add_months(month, -12) == datetime(2024, 12, 1)
+    assert partition_name(add_months(month, 1)) == "internship_history_p202601"
+
+
+# _____________Against Postgres_____________
+
+LISTINGS = [
+    {
+        "id": f"hist-{i}",
+        "company_name": "Acme",
+        "title": "Intern",
+        "date_posted": 1751328000 + i,
+        "active": True,
+    }
+    for i in range(3)
+]
+
+
+@pytest.fixture
+def ingest(monkeypatch):
+    monkeypatch.setattr(fetch_internships, "SessionLocal", TestingSessionLocal)
+    return lambda listings: bulk_update_internships(
+        map(to_row, listings), source="test-feed"
+    )
+
+
+def partitions(db):
+    return set(
+        db.scalars(
+            text(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = 'internship_history'::regclass"
+            )
+        )
+    )
+
+
+def events(db, event):
+    return sorted(
+        db.scalars(
+            select(InternshipHistory.internship_id).where(InternshipHistory.event == event)
+        )
+    )
+
+
+# This and next month's partitions are created; months past retention dropped
+def test_maintain_history_partitions(monkeypatch):
+    monkeypatch.setattr(history, "_partitions", set())
+    db = TestingSessionLocal()
+    db.execute(
+        text(
+            "CREATE TABLE IF NOT EXISTS internship_history_p200001 "
+            "PARTITION OF internship_history "
+            "FOR VALUES FROM ('2000-01-01') TO ('2000-02-01')"
+        )
+    )
+    db.commit()
+    now = fetch_internships.utcnow()
+    maintain_history_partitions(db, now)
+    names = partitions(db)
+    assert partition_name(month_start(now)) in names
+    assert partition_name(add_months(month_start(now), 1)) in names
+    assert "internship_history_p200001" not in names
+    db.close()
+
+
+# Ingest records first sightings and closures, and keeps first_seen_at
+def test_ingest_records_history(ingest):
+    ingest(LISTINGS)
+    db = TestingSessionLocal()
+    assert events(db, FIRST_SEEN) == ["hist-0", "hist-1", "hist-2"]
+    first_seen = db.get(Internship, "hist-1").first_seen_at
+    db.close()
+
+    closed = [dict(item) for item in LISTINGS]
+    closed[1]["active"] = False
+    ingest(closed)
+    ingest(closed)  # nothing changed this time
+    db = TestingSessionLocal()
+    assert events(db, FIRST_SEEN) == ["hist-0", "hist-1", "hist-2"]
+    assert events(db, DEACTIVATED) == ["hist-1"]
+    assert db.get(Internship, "hist-1").first_seen_at == first_seen
+    source = db.scalar(select(InternshipHistory.source).limit(1))
+    assert source == "test-feed"
+    db.close()
+
+
+# Unchanged postings get last_seen_at moved once it is older than the resolution
+def test_ingest_moves_last_seen(ingest):
+    ingest(LISTINGS)
+    db = TestingSessionLocal()
+    stale = fetch_internships.utcnow() - LAST_SEEN_RESOLUTION - timedelta(hours=1)
+    db.execute(
+        update(Internship)
+        .where(Internship.id == "hist-0")
+        .values(last_seen_at=stale)
+    )
+    db.commit()
+    db.close()
+
+    assert ingest(LISTINGS)["unchanged"] == 3
+    db = TestingSessionLocal()
+    assert db.get(Internship, "hist-0").last_seen_at > stale
+    db.close()
+
+
+# Walking next_cursor returns each change once, newest first
+def test_changes_endpoint(client, ingest):
+    ingest(LISTINGS)
+    closed = [dict(item) for item in LISTINGS]
+    closed[2]["active"] = False
+    ingest(closed)
+
+    seen = []
+    params = {"event": FIRST_SEEN, "limit": 2}
+    while True:
+        page = client.get("/api/internships/changes", params=params).json()
+        seen.extend(r["id"] for r in page["results"])
+        if not page["next_cursor"]:
+            break
+        params["cursor"] = page["next_cursor"]
+    assert sorted(seen) == ["hist-0", "hist-1", "hist-2"]
+    assert len(seen) == len(set(seen))
+
+    response = client.get("/api/internships/changes", params={"event": DEACTIVATED})
+    assert [r["id"] for r in response.json()["results"]] == ["hist-2"]
+
+    since = (datetime.now(timezone.utc) + timedelta(hours=1)).isoformat()
+    response = client.get("/api/internships/changes", params={"since": since})
+    assert response.json()["results"] == []
+
+    response = client.get("/api/internships/changes", params={"event": "nope"})
+    assert response.status_code == 400
+
+
+# seen_since keeps postings first seen after that time
+def test_search_seen_since(client, ingest):
+    ingest(LISTINGS)
+    db = TestingSessionLocal()
+    db.execute(
+        update(Internship)
+        .where(Internship.id == "hist-0")
+        .values(first_seen_at=datetime(2020, 1, 1))
+    )
+    db.commit()
+    db.close()
+
+    since = (datetime.now(timezone.utc) - timedelta(days=1)).isoformat()
+    response = client.get("/api/internships/search", params={"seen_since": since})
+    assert sorted(r["id"] for r in response.json()["results"]) == ["hist-1", "hist-2"]
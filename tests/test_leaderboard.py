@@ -0,0 +1,70 @@
+import asyncio
+import os
+import sys
+
+sys.path.insert(1, os.getcwd())
+from app.leaderboard import FenwickTree, Ranking
+
+
+# _____________Testing Leaderboard Ranking_____________
+
+
+def test_fenwick_prefix_sums_and_growth():
+    tree = FenwickTree(size=4)
+    tree.add(1, 2)
+    tree.add(3, 1)
+    tree.add(50, 1)  # past the initial size
+    assert tree.prefix(0) == 0
+    assert tree.prefix(1) == 2
+    assert tree.prefix(49) == 3
+    assert tree.prefix(1000) == 4
+    assert tree.total == 4
+
+
+# Ranks follow point changes; ties share a rank
+def test_ranking_follows_point_changes():
+    ranking = Ranking()
+    ranking.tree = FenwickTree()
+    for points in (0, 10, 10, 25):
+        ranking.tree.add(points, 1)
+    assert ranking.rank(25) == 1
+    assert ranking.rank(10) == 2
+    assert ranking.rank(0) == 4
+
+    ranking.on_points_changed("10 30")
+    assert ranking.rank(30) == 1
+    assert ranking.rank(25) == 2
+    assert ranking.rank(10) == 3
+
+    ranking.on_points_changed("rebuild")
+    assert ranking.tree is None
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+class FakeSession:
+    """Answers the ranking's GROUP BY points query."""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def execute(self, statement):
+        return FakeResult(self.rows)
+
+
+# A rebuild notification between ensure_loaded and rank doesn't break ranking
+def test_rank_against_the_loaded_tree():
+    ranking = Ranking()
+    tree = asyncio.run(ranking.ensure_loaded(FakeSession([(5, 1), (20, 2)])))
+    assert ranking.tree is tree
+
+    ranking.on_points_changed(None)
+    assert ranking.tree is None
+    assert ranking.rank(20, tree) == 1
+    assert ranking.rank(5, tree) == 3
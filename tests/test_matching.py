@@ -0,0 +1,88 @@
+import os
+import sys
+
+from sqlalchemy import select
+
+sys.path.insert(1, os.getcwd())
+from app.matching import normalize_company, refresh_matches_for_internships
+from app.models import Internship, Notification, User, WatchlistItem, WatchlistMatch
+from conftest import TEST_USERNAME, TestingSessionLocal
+
+
+# _____________Testing Watchlist Matches_____________
+
+
+def add_internship(db, id, company, active=True):
+    db.add(
+        Internship(
+            id=id,
+            company=company,
+            company_key=normalize_company(company),
+            role="Intern",
+            active=active,
+        )
+    )
+
+
+def matched_ids(db, user_id):
+    db.expire_all()
+    return set(
+        db.scalars(
+            select(WatchlistMatch.internship_id).where(WatchlistMatch.user_id == user_id)
+        )
+    )
+
+
+def test_normalize_company():
+    assert normalize_company("Jane Street, LLC") == "jane street llc"
+    assert normalize_company("  jane-street   LLC ") == "jane street llc"
+    assert normalize_company(None) == ""
+
+
+# Adding a company matches its existing postings under any spelling;
+# removing it drops them again
+def test_watchlist_endpoints_maintain_matches(client):
+    db = TestingSessionLocal()
+    user_id = db.scalar(select(User.id).where(User.username == TEST_USERNAME))
+    add_internship(db, "js-1", "Jane Street, LLC")
+    add_internship(db, "js-2", "Jane Street LLC")
+    add_internship(db, "other", "Stripe")
+    db.commit()
+
+    client.post("/add_to_watchlist", data={"company_name": "jane street llc"})
+    assert matched_ids(db, user_id) == {"js-1", "js-2"}
+
+    client.post("/remove_from_watchlist", data={"company_name": "Jane Street, LLC"})
+    assert matched_ids(db, user_id) == set()
+    db.close()
+
+
+# Ingest matches new postings, queues a notification once, and moves a
+# renamed posting between companies
+def test_ingest_refreshes_matches(client):
+    db = TestingSessionLocal()
+    user_id = db.scalar(select(User.id).where(User.username == TEST_USERNAME))
+    db.add(WatchlistItem(user_id=user_id, company_name="Stripe", company_key="stripe"))
+    add_internship(db, "s-1", "Stripe")
+    add_internship(db, "s-2", "Stripe", active=False)
+    db.flush()
+    refresh_matches_for_internships(db, ["s-1", "s-2"])
+    db.commit()
+    assert matched_ids(db, user_id) == {"s-1", "s-2"}
+    # only open postings are announced
+    assert db.scalars(select(Notification.internship_id)).all() == ["s-1"]
+
+    posting = db.get(Internship, "s-1")
+    posting.company, posting.company_key = "Stripe Payments", "stripe payments"
+    db.flush()
+    refresh_matches_for_internships(db, ["s-1"])
+    db.commit()
+    assert matched_ids(db, user_id) == {"s-2"}
+
+    posting.company, posting.company_key = "Stripe", "stripe"
+    db.flush()
+    refresh_matches_for_internships(db, ["s-1"])
+    db.commit()
+    assert matched_ids(db, user_id) == {"s-1", "s-2"}
+    assert db.scalars(select(Notification.internship_id)).all() == ["s-1"]
+    db.close()
@@ -0,0 +1,68 @@
+import os
+import sys
+
+from sqlalchemy import select
+
+sys.path.insert(1, os.getcwd())
+from app.models import Internship, Notification, NotificationCursor, User
+from conftest import TEST_USERNAME, TestingSessionLocal
+
+
+# _____________Testing the Notification Outbox_____________
+
+
+def queue_notifications(active_flags):
+    """One internship and outbox entry per flag; returns the user id."""
+    db = TestingSessionLocal()
+    user_id = db.scalar(select(User.id).where(User.username == TEST_USERNAME))
+    for i, active in enumerate(active_flags):
+        db.add(
+            Internship(
+                id=f"notify-{i}", company="Acme", role="Intern", active=active
+            )
+        )
+    db.flush()
+    for i in range(len(active_flags)):
+        db.add(Notification(user_id=user_id, internship_id=f"notify-{i}"))
+    db.commit()
+    db.close()
+    return user_id
+
+
+def last_seen_id(user_id):
+    db = TestingSessionLocal()
+    try:
+        return db.scalar(
+            select(NotificationCursor.last_seen_id).where(
+                NotificationCursor.user_id == user_id
+            )
+        )
+    finally:
+        db.close()
+
+
+# Each entry for an open posting is returned exactly once, in order
+def test_each_notification_returned_once(client):
+    queue_notifications([i % 4 != 0 for i in range(25)])
+    seen = []
+    for _ in range(5):
+        seen.extend(
+            i["id"] for i in client.get("/api/notifications").json()["new_internships"]
+        )
+    assert seen == [f"notify-{i}" for i in range(25) if i % 4 != 0]
+
+
+# A backlog of closed postings still moves the cursor forward
+def test_cursor_skips_closed_postings(client):
+    user_id = queue_notifications([False] * 12)
+    assert client.get("/api/notifications").json()["new_internships"] == []
+    first = last_seen_id(user_id)
+    assert first is not None
+    client.get("/api/notifications")
+    second = last_seen_id(user_id)
+    assert second > first
+    db = TestingSessionLocal()
+    assert second == db.scalar(
+        select(Notification.id).order_by(Notification.id.desc()).limit(1)
+    )
+    db.close()
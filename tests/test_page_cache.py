@@ -0,0 +1,49 @@
+import os
+import sys
+
+from fastapi.responses import HTMLResponse
+
+sys.path.insert(1, os.getcwd())
+from app import page_cache
+from app.cache import TTLCache
+
+
+# _____________Testing Rendered Page Cache_____________
+
+
+# Least recently used pages are evicted to stay within the byte budget
+def test_cache_memory_budget():
+    cache = TTLCache(maxsize=100, ttl=60, maxbytes=10, sizeof=len)
+    cache.set("a", b"1234")
+    cache.set("b", b"1234")
+    cache.get("a")
+    cache.set("c", b"1234")  # evicts "b"
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1234"
+    assert cache.nbytes == 8
+    cache.set("huge", b"x" * 11)  # larger than the whole budget
+    assert cache.get("huge") is None
+
+
+# A user's write or an ingest makes previously rendered pages unreachable
+def test_versions_invalidate_pages():
+    key = page_cache.page_key(7, "/dashboard")
+    page_cache.store_page(key, HTMLResponse("<p>hi</p>"))
+    assert page_cache.get_page(page_cache.page_key(7, "/dashboard")).body == b"<p>hi</p>"
+
+    page_cache.bump_user_version(7)
+    assert page_cache.get_page(page_cache.page_key(7, "/dashboard")) is None
+
+    key = page_cache.page_key(7, "/dashboard")
+    page_cache.store_page(key, HTMLResponse("<p>hi</p>"))
+    page_cache.bump_global_version()
+    assert page_cache.get_page(page_cache.page_key(7, "/dashboard")) is None
+
+
+# Banners from the query string are never served from (or stored in) the cache
+def test_internships_banners_not_cached(client):
+    assert "Application logged" not in client.get("/internships").text
+    assert "Application logged" in client.get("/internships?success=applied").text
+    assert "Application logged" not in client.get("/internships").text
+    response = client.get("/internships?error=already_applied")
+    assert "already" in response.text.lower()
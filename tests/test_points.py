@@ -0,0 +1,35 @@
+import os
+import sys
+
+from sqlalchemy import func, select
+
+sys.path.insert(1, os.getcwd())
+from app.models import PointsLedger, User
+from app.points import rebuild_points
+from conftest import TEST_USERNAME, TestingSessionLocal
+
+
+# _____________Testing Points Ledger_____________
+
+
+# Every award is recorded, and the total can be rebuilt from the ledger
+def test_checkin_is_recorded_in_ledger(client):
+    response = client.post("/api/checkin")
+    assert response.status_code == 200
+
+    db = TestingSessionLocal()
+    user = db.scalar(select(User).where(User.username == TEST_USERNAME))
+    entries = db.scalars(
+        select(PointsLedger).where(PointsLedger.user_id == user.id)
+    ).all()
+    assert [(e.delta, e.reason, e.balance) for e in entries] == [(2, "checkin", 2)]
+
+    user.points = 99
+    db.commit()
+    assert rebuild_points(db, [user.id]) == [user.id]
+    db.commit()
+    assert db.scalar(select(User.points).where(User.id == user.id)) == 2
+    assert db.scalar(
+        select(func.sum(PointsLedger.delta)).where(PointsLedger.user_id == user.id)
+    ) == 2
+    db.close()
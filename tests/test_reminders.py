@@ -0,0 +1,126 @@
+from datetime import datetime, timedelta
+import os
+import sys
+
+import psycopg2
+from sqlalchemy import select
+
+sys.path.insert(1, os.getcwd())
+from app.events import REMINDER_CHANNEL
+from app.models import Notification, Reminder, User
+from app.reminders import REMINDER_DUE, ReminderScheduler
+from conftest import TestingSessionLocal, engine
+
+
+# _____________Testing Reminder Scheduler_____________
+
+START = datetime(2025, 3, 10, 12, 0)
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def add_reminder(db, user_id, due_date):
+    reminder = Reminder(
+        user_id=user_id, text="Apply", company="Acme", role="Intern", due_date=due_date
+    )
+    db.add(reminder)
+    db.commit()
+    return reminder.id
+
+
+def notified(db):
+    return set(
+        db.scalars(
+            select(Notification.reminder_id).where(Notification.kind == REMINDER_DUE)
+        )
+    )
+
+
+def test_scheduler_notifies_as_reminders_come_due():
+    db = TestingSessionLocal()
+    user = User(username="planner", email="planner@example.com", password_hash="x")
+    db.add(user)
+    db.commit()
+    tomorrow = add_reminder(db, user.id, START + timedelta(days=1))
+    in_five_days = add_reminder(db, user.id, START + timedelta(days=5))
+    next_month = add_reminder(db, user.id, START + timedelta(days=30))
+
+    clock = FakeClock(START)
+    scheduler = ReminderScheduler(clock=clock, due_soon=timedelta(days=3))
+    assert scheduler.tick(db) == 1
+    db.commit()
+    assert notified(db) == {tomorrow}
+    # the heap only holds the current window, not the whole table
+    assert next_month not in scheduler.scheduled
+
+    # Added after the window was loaded, picked up by id
+    in_an_hour = add_reminder(db, user.id, START + timedelta(hours=1))
+    assert scheduler.tick(db) == 1
+    db.commit()
+    assert notified(db) == {tomorrow, in_an_hour}
+
+    clock.now = START + timedelta(days=2)
+    assert scheduler.tick(db) == 1
+    db.commit()
+    assert in_five_days in notified(db)
+    assert next_month not in notified(db)
+    db.close()
+
+
+# Completed (deleted) reminders are skipped, and reloads don't notify twice
+def test_scheduler_skips_deleted_and_repeats():
+    db = TestingSessionLocal()
+    user = User(username="planner2", email="planner2@example.com", password_hash="x")
+    db.add(user)
+    db.commit()
+    kept = add_reminder(db, user.id, START + timedelta(days=4))
+    completed = add_reminder(db, user.id, START + timedelta(days=4))
+
+    clock = FakeClock(START)
+    scheduler = ReminderScheduler(clock=clock, due_soon=timedelta(days=3))
+    assert scheduler.tick(db) == 0
+    db.delete(db.get(Reminder, completed))
+    db.commit()
+
+    clock.now = START + timedelta(days=1, hours=1)
+    assert scheduler.tick(db) == 1
+    db.commit()
+    assert notified(db) == {kept}
+
+    scheduler.loaded_at = None  # force a reload
+    assert scheduler.tick(db) == 0
+    db.close()
+
+
+# Users with new reminder notifications are signalled once the tick commits
+def test_scheduler_signals_notified_users():
+    # A connection of its own, outside the pool, like the broker's
+    listener = psycopg2.connect(
+        engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+    )
+    listener.autocommit = True
+    with listener.cursor() as cursor:
+        cursor.execute(f'LISTEN "{REMINDER_CHANNEL}"')
+
+    db = TestingSessionLocal()
+    user = User(username="planner3", email="planner3@example.com", password_hash="x")
+    db.add(user)
+    db.commit()
+    add_reminder(db, user.id, START + timedelta(days=1))
+    add_reminder(db, user.id, START + timedelta(days=2))
+
+    scheduler = ReminderScheduler(clock=FakeClock(START), due_soon=timedelta(days=3))
+    assert scheduler.tick(db) == 2
+    db.commit()
+    db.close()
+
+    listener.poll()
+    payloads = [notify.payload for notify in listener.notifies]
+    listener.close()
+    assert payloads == [str(user.id)]
@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta
+import os
+import sys
+
+sys.path.insert(1, os.getcwd())
+from app.models import Internship
+from conftest import TestingSessionLocal
+
+
+# _____________Testing Internship Search_____________
+
+
+def add_internships(count):
+    db = TestingSessionLocal()
+    for i in range(count):
+        db.add(
+            Internship(
+                id=f"intern-{i}",
+                company="Google" if i % 2 == 0 else "Stripe",
+                company_key="google" if i % 2 == 0 else "stripe",
+                role="Software Engineer Intern",
+                location="New York, NY",
+                # a few undated postings to exercise the NULLS LAST cursor
+                date_posted=(
+                    None if i % 5 == 0 else datetime(2025, 7, 1) + timedelta(hours=i)
+                ),
+                active=i % 3 != 0,
+                season="Summer",
+            )
+        )
+    db.commit()
+    db.close()
+
+
+# Full-text search finds the company and respects the active filter
+def test_search_by_company(client):
+    add_internships(12)
+    response = client.get("/api/internships/search", params={"q": "google"})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert len(results) == 6
+    assert all(r["company"] == "Google" for r in results)
+
+    response = client.get(
+        "/api/internships/search", params={"q": "google", "active": "true"}
+    )
+    assert all(r["active"] for r in response.json()["results"])
+
+
+# Walking next_cursor returns every row exactly once
+def test_search_keyset_pagination(client):
+    add_internships(12)
+    seen = []
+    params = {"limit": 5}
+    while True:
+        page = client.get("/api/internships/search", params=params).json()
+        seen.extend(r["id"] for r in page["results"])
+        if not page["next_cursor"]:
+            break
+        params["cursor"] = page["next_cursor"]
+    assert sorted(seen) == sorted(f"intern-{i}" for i in range(12))
+    assert len(seen) == len(set(seen))
+
+
+def test_search_invalid_cursor(client):
+    response = client.get("/api/internships/search", params={"cursor": "nope"})
+    assert response.status_code == 400
@@ -0,0 +1,43 @@
+from datetime import date, datetime, timedelta
+import os
+import sys
+
+from sqlalchemy import select
+
+sys.path.insert(1, os.getcwd())
+from app.models import CheckIn, User
+from app.streaks import streaks_query
+from conftest import TEST_USERNAME, TestingSessionLocal
+
+
+# _____________Testing Check-in Streaks_____________
+
+
+# A second check-in on the same day is rejected by the unique constraint
+def test_checkin_is_idempotent(client):
+    assert client.post("/api/checkin").status_code == 200
+    response = client.post("/api/checkin")
+    assert response.status_code == 400
+    assert response.json()["message"] == "Already checked in"
+
+
+def test_current_and_longest_streaks(client):
+    today = date(2025, 3, 10)
+    db = TestingSessionLocal()
+    user_id = db.scalar(select(User.id).where(User.username == TEST_USERNAME))
+    # a 4-day run ending a month ago and a 2-day run ending yesterday
+    days = [today - timedelta(days=n) for n in (30, 31, 32, 33, 1, 2)]
+    for day in days:
+        db.add(
+            CheckIn(
+                user_id=user_id,
+                date=datetime.combine(day, datetime.min.time()),
+                checkin_day=day,
+            )
+        )
+    db.commit()
+    row = db.execute(streaks_query(user_id, today)).one()
+    assert (row.current, row.longest) == (2, 4)
+    row = db.execute(streaks_query(user_id, today + timedelta(days=2))).one()
+    assert row.current == 0
+    db.close()
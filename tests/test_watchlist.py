@@ -0,0 +1,47 @@
+import os
+import sys
+
+sys.path.insert(1, os.getcwd())
+from app.matching import refresh_companies
+from app.models import Company, Internship
+from conftest import TestingSessionLocal
+
+
+# _____________Testing Companies Watchlist Page_____________
+
+
+def add_internships():
+    db = TestingSessionLocal()
+    for i, company in enumerate(["Google", "Goldman Sachs", "Stripe", "Google"]):
+        db.add(
+            Internship(
+                id=f"watch-{i}",
+                company=company,
+                company_key=company.lower(),
+                role="Intern",
+                active=i != 3,
+            )
+        )
+    db.flush()
+    refresh_companies(db)
+    db.commit()
+    db.close()
+
+
+# Ingest keeps one companies row per key with its active count
+def test_refresh_companies():
+    add_internships()
+    db = TestingSessionLocal()
+    google = db.get(Company, "google")
+    assert google.name == "Google"
+    assert google.active_count == 1
+    db.close()
+
+
+def test_watchlist_prefix_filter(client):
+    add_internships()
+    response = client.get("/watchlist", params={"prefix": "Go"})
+    assert response.status_code == 200
+    assert "Google" in response.text
+    assert "Goldman Sachs" in response.text
+    assert "Stripe" not in response.text